@@ -1,10 +1,30 @@
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
 import "./index.css";
+import ProgressBar from "./components/ProgressBar";
+
+const BACKEND_LABELS = {
+  pdfplumber: "pdfplumber (most accurate)",
+  pdfminer: "pdfminer (tuned)",
+  pdfium: "pdfium (fast)",
+  pymupdf: "PyMuPDF (fastest)",
+};
 
 function App() {
   const [jobData, setJobData] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
+  const [progress, setProgress] = useState(null);
+  const [section, setSection] = useState(null);
+  const [jobId, setJobId] = useState(null);
+  const [backends, setBackends] = useState(["pdfplumber"]);
+
+  useEffect(() => {
+    // only offer backends that are installed on the server
+    fetch("http://localhost:8000/backends")
+      .then((res) => (res.ok ? res.json() : { backends: ["pdfplumber"] }))
+      .then((data) => setBackends(data.backends))
+      .catch(() => {});
+  }, []);
 
   const handleUpload = async (e) => {
     e.preventDefault();
@@ -13,24 +33,65 @@ function App() {
     setLoading(true);
     setError("");
     setJobData(null);
+    setProgress(null);
 
     try {
-      const res = await fetch("http://localhost:8000/parse", {
+      const res = await fetch("http://localhost:8000/jobs", {
         method: "POST",
         body: formData,
       });
 
-      if (!res.ok) throw new Error(`Error: ${res.status} ${res.statusText}`);
+      if (!res.ok) {
+        // admission rejections carry a reason (scanned PDF, too many pages, lane full)
+        const body = await res.json().catch(() => ({}));
+        throw new Error(body.detail?.reason || body.detail || `Error: ${res.status} ${res.statusText}`);
+      }
 
-      const data = await res.json();
-      setJobData(data);
+      const job = await res.json();
+      setJobId(job.job_id);
+      const events = new EventSource(`http://localhost:8000${job.events}`);
+      events.addEventListener("progress", (ev) => setProgress(JSON.parse(ev.data)));
+      events.addEventListener("completed", (ev) => {
+        events.close();
+        setJobData(JSON.parse(ev.data));
+        setProgress(null);
+        setLoading(false);
+      });
+      events.addEventListener("failed", (ev) => {
+        events.close();
+        setError(JSON.parse(ev.data).error || "Parse failed");
+        setLoading(false);
+      });
+      events.addEventListener("cancelled", () => {
+        events.close();
+        setProgress(null);
+        setLoading(false);
+      });
+      events.onerror = () => {
+        if (events.readyState === EventSource.CLOSED) {
+          setError("Lost connection to progress stream");
+          setLoading(false);
+        }
+      };
     } catch (err) {
       setError(err.message || "Upload failed");
-    } finally {
       setLoading(false);
     }
   };
 
+  const handleCancel = async () => {
+    await fetch(`http://localhost:8000/jobs/${jobId}/cancel`, { method: "POST" });
+  };
+
+  const handleSectionLookup = async (e) => {
+    e.preventDefault();
+    const sectionId = new FormData(e.target).get("section_id");
+    const res = await fetch(
+      `http://localhost:8000/jobs/${jobData.job_id}/sections/${encodeURIComponent(sectionId)}`
+    );
+    setSection(res.ok ? await res.json() : { full_path: sectionId, text: "Section not found" });
+  };
+
   return (
     <div className="container">
       <h1>USB PD Specification Parser</h1>
@@ -38,11 +99,26 @@ function App() {
         <input type="file" name="file" accept="application/pdf" required />
         <input type="number" name="toc_start" placeholder="ToC Start Page" />
         <input type="number" name="toc_end" placeholder="ToC End Page" />
+        <input type="text" name="sections" placeholder="Sections (e.g. 6, 6.4.*)" />
+        <input type="text" name="pages" placeholder="Pages (e.g. 120-180)" />
+        <select name="backend" defaultValue="pdfplumber">
+          {backends.map((name) => (
+            <option key={name} value={name}>
+              {BACKEND_LABELS[name] || name}
+            </option>
+          ))}
+        </select>
         <button type="submit" disabled={loading}>
           {loading ? "Processing..." : "Upload & Parse"}
         </button>
       </form>
 
+      {loading && <ProgressBar progress={progress} />}
+      {loading && jobId && (
+        <button type="button" onClick={handleCancel}>
+          Cancel
+        </button>
+      )}
       {error && <p className="error">{error}</p>}
 
       {jobData && (
@@ -52,6 +128,7 @@ function App() {
             <li>📑 ToC Entries: {jobData.counts.toc}</li>
             <li>📄 Sections: {jobData.counts.sections}</li>
             <li>📊 Metadata: {jobData.counts.metadata}</li>
+            <li>🧩 Chunks: {jobData.counts.chunks}</li>
             <li>✅ Validations: {jobData.counts.validation}</li>
           </ul>
 
@@ -60,8 +137,21 @@ function App() {
             <li><a href={`http://localhost:8000${jobData.files.toc_jsonl}`} download>Download ToC JSONL</a></li>
             <li><a href={`http://localhost:8000${jobData.files.sections_jsonl}`} download>Download Sections JSONL</a></li>
             <li><a href={`http://localhost:8000${jobData.files.metadata_jsonl}`} download>Download Metadata JSONL</a></li>
+            <li><a href={`http://localhost:8000${jobData.files.chunks_jsonl}`} download>Download Chunks JSONL</a></li>
             <li><a href={`http://localhost:8000${jobData.files.validation_xlsx}`} download>Download Validation Report</a></li>
           </ul>
+
+          <h3>🔎 Section Lookup</h3>
+          <form onSubmit={handleSectionLookup}>
+            <input type="text" name="section_id" placeholder="Section ID (e.g. 6.4.1)" required />
+            <button type="submit">Show</button>
+          </form>
+          {section && (
+            <div className="section">
+              <h4>{section.full_path}</h4>
+              <p>{section.text}</p>
+            </div>
+          )}
         </>
       )}
     </div>
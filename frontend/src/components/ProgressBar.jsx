@@ -0,0 +1,22 @@
+import React from "react";
+
+function ProgressBar({ progress }) {
+  if (!progress) return null;
+
+  const { stage, done, total, rows, eta_s } = progress;
+  const pct = total ? Math.round((done / total) * 100) : null;
+
+  return (
+    <div className="progress">
+      <p>
+        ⏳ {stage}
+        {total ? ` — ${done}/${total}` : ""}
+        {rows ? ` · ${rows} rows` : ""}
+        {eta_s != null && eta_s > 0 ? ` · ~${Math.ceil(eta_s)}s left` : ""}
+      </p>
+      {pct !== null && <progress value={pct} max="100" />}
+    </div>
+  );
+}
+
+export default ProgressBar;
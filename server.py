@@ -1,14 +1,32 @@
 # server.py
+import asyncio
+import json
 import os
 import shutil
+import threading
 import uuid
 import logging
-from typing import Optional
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from usb_pd_parser.admission import (
+    AdmissionController,
+    AdmissionDecision,
+    BudgetExceeded,
+    JobCancelled,
+    run_with_budget,
+)
+from usb_pd_parser.backends import available_backends, get_backend
+from usb_pd_parser.config import Config
+from usb_pd_parser.jsonl_index import IndexCache, JsonlIndex
 from usb_pd_parser.pipeline import run_pipeline
+from usb_pd_parser.preflight import preflight
+from usb_pd_parser.utils import parse_page_range, parse_section_filter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("server")
@@ -30,42 +48,112 @@ class ParseResponse(BaseModel):
     files: dict
     out_dir: str
 
-@app.post("/parse", response_model=ParseResponse)
-async def parse_pdf(
-    file: UploadFile = File(...),
-    doc_title: str = Form("USB Power Delivery Specification"),
-    toc_start: Optional[int] = Form(None),
-    toc_end: Optional[int] = Form(None),
-):
+@dataclass
+class Job:
+    job_id: str
+    doc_title: str
+    status: str = "queued"   # queued | processing | completed | failed | cancelled
+    lane: str = ""
+    admission: Optional[dict] = None
+    events: List[dict] = field(default_factory=list)
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    cancel: threading.Event = field(default_factory=threading.Event)
+
+
+TERMINAL = ("completed", "failed", "cancelled")
+
+# In-process job registry; progress events are appended by the worker thread
+JOBS: Dict[str, Job] = {}
+
+ADMISSION = AdmissionController(Config())
+UPLOAD_CHUNK = 1024 * 1024
+
+
+class UploadLimitMiddleware:
+    """Refuse uploads over ``max_upload_mb`` before Starlette spools them to disk.
+
+    A declared Content-Length over the limit is rejected straight away; otherwise the
+    body is counted as it arrives (this covers chunked uploads too) and the request is
+    aborted with 413 as soon as the count passes the limit.
+    """
+
+    PATHS = ("/parse", "/jobs")
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.PATHS:
+            return await self.app(scope, receive, send)
+
+        max_mb = ADMISSION.cfg.max_upload_mb
+        # allow a little headroom for the multipart envelope and form fields
+        limit = max_mb * 1024 * 1024 + 64 * 1024
+        too_large = HTTPException(status_code=413, detail=f"file exceeds {max_mb} MB")
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > limit:
+            response = JSONResponse(status_code=413, content={"detail": too_large.detail})
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # surfaces from the form parser and is turned into a 413 by FastAPI
+                    raise too_large
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(UploadLimitMiddleware)
+
+
+def _save_upload(file: UploadFile, max_mb: int) -> str:
+    """Copy the upload to disk, giving up with 413 as soon as it exceeds ``max_mb``."""
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Please upload a PDF file.")
 
     os.makedirs("uploads", exist_ok=True)
     upload_path = os.path.join("uploads", f"{uuid.uuid4()}.pdf")
+    limit = max_mb * 1024 * 1024
+    written = 0
     with open(upload_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+        while chunk := file.file.read(UPLOAD_CHUNK):
+            written += len(chunk)
+            if written > limit:
+                break
+            f.write(chunk)
+    if written > limit:
+        os.remove(upload_path)
+        raise HTTPException(status_code=413, detail=f"file exceeds {max_mb} MB")
+    return upload_path
 
-    os.makedirs("outputs", exist_ok=True)
-    job_id = str(uuid.uuid4())
-    out_dir = os.path.join("outputs", job_id)
 
+def _pipeline_options(sections: Optional[str], pages: Optional[str], backend: str) -> dict:
     try:
-        result = run_pipeline(
-            pdf_path=upload_path,
-            doc_title=doc_title,
-            out_dir=out_dir,
-            toc_start=toc_start,
-            toc_end=toc_end,
-        )
-    except Exception as e:
-        logger.exception("Pipeline failed")
-        raise HTTPException(status_code=500, detail=f"Pipeline failed: {e}")
+        get_backend(backend)
+        return {
+            "section_filter": parse_section_filter(sections) if sections else None,
+            "page_range": parse_page_range(pages) if pages else None,
+            "backend": backend,
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
+def _build_response(job_id: str, doc_title: str, out_dir: str, result: dict) -> ParseResponse:
     # Count entries
     counts = {
         "toc": sum(1 for _ in open(result["toc"], "r", encoding="utf-8")),
         "sections": sum(1 for _ in open(result["sections"], "r", encoding="utf-8")),
         "metadata": sum(1 for _ in open(result["metadata"], "r", encoding="utf-8")),
+        "chunks": sum(1 for _ in open(result["chunks"], "r", encoding="utf-8")),
         "validation": 1 if os.path.isfile(result["report"]) else 0,
     }
 
@@ -73,6 +161,7 @@ async def parse_pdf(
         "toc_jsonl": f"/download/{job_id}/{os.path.basename(result['toc'])}",
         "sections_jsonl": f"/download/{job_id}/{os.path.basename(result['sections'])}",
         "metadata_jsonl": f"/download/{job_id}/{os.path.basename(result['metadata'])}",
+        "chunks_jsonl": f"/download/{job_id}/{os.path.basename(result['chunks'])}",
         "validation_xlsx": f"/download/{job_id}/{os.path.basename(result['report'])}",
     }
 
@@ -84,6 +173,275 @@ async def parse_pdf(
         out_dir=out_dir,
     )
 
+
+def _admit(upload_path: str, backend: str) -> AdmissionDecision:
+    """Preflight the upload and reserve a lane queue place, or reject the job outright."""
+    try:
+        report = preflight(upload_path)
+    except Exception:
+        os.remove(upload_path)
+        raise
+    decision = ADMISSION.decide(report, backend)
+    if decision.admitted and not ADMISSION.enqueue(decision.lane):
+        decision = AdmissionDecision(
+            False, lane=decision.lane, reason=f"{decision.lane} lane is full, retry later", status_code=503
+        )
+    if not decision.admitted:
+        os.remove(upload_path)
+        raise HTTPException(
+            status_code=decision.status_code,
+            detail={"reason": decision.reason, "preflight": report.to_dict()},
+        )
+    return decision
+
+
+def _submit(
+    file: UploadFile,
+    doc_title: str,
+    toc_start: Optional[int],
+    toc_end: Optional[int],
+    sections: Optional[str],
+    pages: Optional[str],
+    backend: str,
+) -> tuple:
+    options = _pipeline_options(sections, pages, backend)
+    upload_path = _save_upload(file, ADMISSION.cfg.max_upload_mb)
+    decision = _admit(upload_path, backend)
+
+    os.makedirs("outputs", exist_ok=True)
+    job_id = str(uuid.uuid4())
+    out_dir = os.path.join("outputs", job_id)
+
+    job = Job(job_id=job_id, doc_title=doc_title, lane=decision.lane, admission=decision.to_dict())
+    JOBS[job_id] = job
+    kwargs = dict(
+        pdf_path=upload_path,
+        doc_title=doc_title,
+        out_dir=out_dir,
+        toc_start=toc_start,
+        toc_end=toc_end,
+        **options,
+    )
+    return job, decision, kwargs
+
+
+def _run_job(job: Job, decision: AdmissionDecision, kwargs: dict) -> None:
+    """Wait for a lane slot, then run the pipeline in a child process under the job's budget."""
+    out_dir = kwargs["out_dir"]
+    try:
+        if not ADMISSION.wait_for_slot(decision.lane, job.cancel):
+            raise JobCancelled("cancelled while queued")
+        try:
+            job.status = "processing"
+            result = run_with_budget(run_pipeline, kwargs, decision.budget, job.events.append, job.cancel)
+        finally:
+            ADMISSION.release(decision.lane)
+        job.result = _build_response(job.job_id, job.doc_title, out_dir, result).model_dump()
+        job.status = "completed"
+    except JobCancelled as e:
+        job.error = str(e)
+        job.status = "cancelled"
+    except BudgetExceeded as e:
+        logger.warning("Job %s stopped: %s", job.job_id, e)
+        job.error = f"Budget exceeded: {e}"
+        job.status = "failed"
+    except Exception as e:
+        logger.exception("Pipeline failed for job %s", job.job_id)
+        job.error = f"Pipeline failed: {e}"
+        job.status = "failed"
+    if job.status != "completed":
+        # never leave partial outputs behind
+        INDEXES.invalidate(out_dir)
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+@app.post("/parse", response_model=ParseResponse)
+async def parse_pdf(
+    file: UploadFile = File(...),
+    doc_title: str = Form("USB Power Delivery Specification"),
+    toc_start: Optional[int] = Form(None),
+    toc_end: Optional[int] = Form(None),
+    sections: Optional[str] = Form(None),
+    pages: Optional[str] = Form(None),
+    backend: str = Form("pdfplumber"),
+):
+    # saving and preflighting a large upload must not stall the event loop (and open SSE streams)
+    job, decision, kwargs = await run_in_threadpool(
+        _submit, file, doc_title, toc_start, toc_end, sections, pages, backend
+    )
+    await run_in_threadpool(_run_job, job, decision, kwargs)
+    if job.status != "completed":
+        raise HTTPException(status_code=500, detail=job.error)
+    return ParseResponse(**job.result)
+
+
+@app.post("/jobs")
+async def submit_job(
+    file: UploadFile = File(...),
+    doc_title: str = Form("USB Power Delivery Specification"),
+    toc_start: Optional[int] = Form(None),
+    toc_end: Optional[int] = Form(None),
+    sections: Optional[str] = Form(None),
+    pages: Optional[str] = Form(None),
+    backend: str = Form("pdfplumber"),
+):
+    """Admit and start a parse in the background; follow it via GET /jobs/{job_id}/events."""
+    job, decision, kwargs = await run_in_threadpool(
+        _submit, file, doc_title, toc_start, toc_end, sections, pages, backend
+    )
+    threading.Thread(target=_run_job, args=(job, decision, kwargs), daemon=True).start()
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "lane": job.lane,
+        "admission": job.admission,
+        "events": f"/jobs/{job.job_id}/events",
+    }
+
+
+def _get_job(job_id: str) -> Job:
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    job = _get_job(job_id)
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "lane": job.lane,
+        "admission": job.admission,
+        "progress": job.events[-1] if job.events else None,
+        "result": job.result,
+        "error": job.error,
+    }
+
+
+@app.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    """Stop a queued or running job; its partial outputs are removed."""
+    job = _get_job(job_id)
+    if job.status not in TERMINAL:
+        job.cancel.set()
+    return {"job_id": job.job_id, "status": job.status}
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-Sent Events: `progress` events while running, then `completed`, `failed` or `cancelled`."""
+    job = _get_job(job_id)
+
+    async def stream():
+        sent = 0
+        while True:
+            # read status before draining so no event is missed on completion
+            status = job.status
+            while sent < len(job.events):
+                yield f"event: progress\ndata: {json.dumps(job.events[sent])}\n\n"
+                sent += 1
+            if status in TERMINAL:
+                payload = job.result if status == "completed" else {"error": job.error}
+                yield f"event: {status}\ndata: {json.dumps(payload)}\n\n"
+                return
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(
+        stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
+
+# -------------------------
+# Random access into job outputs via the byte-offset index written with each JSONL
+# -------------------------
+OUTPUT_FILES = {
+    "toc": Config().toc_jsonl,
+    "sections": Config().sections_jsonl,
+    "metadata": Config().metadata_jsonl,
+    "chunks": Config().chunks_jsonl,
+}
+
+
+# Open indexes keep their files mapped; evicted ones are closed once idle
+INDEXES = IndexCache(maxsize=16)
+
+
+@contextmanager
+def _job_index(job_id: str, kind: str) -> Iterator[JsonlIndex]:
+    job = JOBS.get(job_id)
+    # a job still running (or one that failed part-way) may have half-written outputs
+    if job is not None and job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    path = os.path.join("outputs", job_id, OUTPUT_FILES[kind])
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="File not found")
+    try:
+        with INDEXES.lease(path) as index:
+            yield index
+    except (FileNotFoundError, KeyError):
+        raise HTTPException(status_code=404, detail="No index for this job's outputs")
+    except ValueError:
+        raise HTTPException(status_code=409, detail="Index does not match this job's outputs")
+
+
+def _page(job_id: str, kind: str, offset: int, limit: int) -> Response:
+    with _job_index(job_id, kind) as index:
+        rows = index.rows(offset, limit)
+        total = len(index)
+    # rows are already JSON; splice them in without parsing
+    head = json.dumps({"total": total, "offset": offset, "limit": limit})[:-1]
+    body = head.encode() + b', "items": [' + b",".join(rows) + b"]}"
+    return Response(content=body, media_type="application/json")
+
+
+def _record(job_id: str, kind: str, key: str) -> Response:
+    with _job_index(job_id, kind) as index:
+        row = index.get(key)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"{key} not found")
+    return Response(content=row, media_type="application/json")
+
+
+@app.get("/jobs/{job_id}/toc")
+def job_toc(job_id: str, offset: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+    return _page(job_id, "toc", offset, limit)
+
+
+@app.get("/jobs/{job_id}/sections")
+def job_sections(job_id: str, offset: int = Query(0, ge=0), limit: int = Query(20, ge=1, le=500)):
+    return _page(job_id, "sections", offset, limit)
+
+
+@app.get("/jobs/{job_id}/sections/{section_id}")
+def job_section(job_id: str, section_id: str):
+    return _record(job_id, "sections", section_id)
+
+
+@app.get("/jobs/{job_id}/metadata")
+def job_metadata(job_id: str, offset: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+    return _page(job_id, "metadata", offset, limit)
+
+
+@app.get("/jobs/{job_id}/chunks")
+def job_chunks(job_id: str, offset: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=500)):
+    return _page(job_id, "chunks", offset, limit)
+
+
+@app.get("/jobs/{job_id}/chunks/{chunk_id}")
+def job_chunk(job_id: str, chunk_id: str):
+    return _record(job_id, "chunks", chunk_id)
+
+
+@app.get("/backends")
+def list_backends():
+    return {"backends": available_backends()}
+
+@app.get("/admission")
+def admission_status():
+    """Jobs currently waiting per lane."""
+    return {"queued": ADMISSION.queued(), "slots": ADMISSION.cfg.lane_slots}
+
 @app.get("/download/{job_id}/{filename}")
 def download_file(job_id: str, filename: str):
     job_dir = os.path.join("outputs", job_id)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from usb_pd_parser.admission import AdmissionController, BudgetExceeded, JobBudget, run_with_budget
+from usb_pd_parser.config import Config
+from usb_pd_parser.preflight import PreflightReport, preflight
+
+
+def _report(pages: int, text: bool = True, size: int = 1024) -> PreflightReport:
+    return PreflightReport(size, pages, text, 1.0 if text else 0.0)
+
+
+def _sleepy(progress, seconds):
+    # module-level so the spawned child can import it
+    time.sleep(seconds)
+    return "done"
+
+
+def test_decide_rejects_and_routes_by_preflight():
+    cfg = Config(max_pages=1000, large_job_pages=200)
+    ctl = AdmissionController(cfg)
+
+    scanned = ctl.decide(_report(10, text=False), "pdfplumber")
+    assert not scanned.admitted and scanned.status_code == 422
+
+    too_long = ctl.decide(_report(1001), "pdfplumber")
+    assert not too_long.admitted and too_long.status_code == 413
+
+    small = ctl.decide(_report(100), "pdfplumber")
+    assert small.admitted and small.lane == "standard"
+    assert small.budget.time_s == cfg.job_min_time_s
+    assert small.budget.memory_mb == cfg.lane_memory_mb["standard"]
+
+    big = ctl.decide(_report(900), "pdfplumber")
+    assert big.admitted and big.lane == "large"
+    # 900 pages * 0.15 s/page * 3.0 slack
+    assert big.budget.time_s == pytest.approx(405.0)
+
+
+def test_lane_queue_limit_and_cancel_while_queued():
+    cfg = Config(lane_slots={"standard": 1, "large": 1}, lane_max_queued={"standard": 1, "large": 1})
+    ctl = AdmissionController(cfg)
+
+    assert ctl.enqueue("standard")
+    assert not ctl.enqueue("standard")
+    assert ctl.wait_for_slot("standard", threading.Event())
+    assert ctl.queued()["standard"] == 0
+
+    # the only slot is taken: a cancelled waiter gives up its queue place
+    assert ctl.enqueue("standard")
+    cancelled = threading.Event()
+    cancelled.set()
+    assert not ctl.wait_for_slot("standard", cancelled, poll_s=0.01)
+    assert ctl.queued()["standard"] == 0
+    ctl.release("standard")
+
+
+def test_run_with_budget_enforces_time_limit():
+    budget = JobBudget(time_s=30, memory_mb=0)
+    assert run_with_budget(_sleepy, {"seconds": 0}, budget, lambda e: None) == "done"
+
+    started = time.monotonic()
+    with pytest.raises(BudgetExceeded):
+        run_with_budget(_sleepy, {"seconds": 30}, JobBudget(time_s=0.5, memory_mb=0), lambda e: None)
+    assert time.monotonic() - started < 15
+
+
+def test_preflight_reports_truncated_pdf_as_unreadable(tmp_path):
+    path = tmp_path / "truncated.pdf"
+    path.write_bytes(b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog /Pages 2 0 R")
+    report = preflight(str(path))
+    assert report.error.startswith("unreadable PDF")
+    decision = AdmissionController(Config()).decide(report, "pdfplumber")
+    assert not decision.admitted and decision.status_code == 422
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import pytest
+
+from usb_pd_parser.backends import BACKENDS, available_backends, get_backend
+from usb_pd_parser.benchmark import Benchmark
+
+
+def test_backend_registry():
+    assert "pdfplumber" in available_backends()
+    assert set(available_backends()) <= set(BACKENDS)
+    assert get_backend("pdfminer").name == "pdfminer"
+    with pytest.raises(ValueError):
+        get_backend("no-such-engine")
+
+
+def test_section_agreement_penalises_missing_and_divergent_text():
+    base = [
+        {"section_id": "1", "text": "alpha beta gamma"},
+        {"section_id": "2", "text": "delta epsilon"},
+    ]
+    assert Benchmark._section_agreement(base, base) == 1.0
+    other = [{"section_id": "1", "text": "alpha beta"}]
+    # section 1 shares 2 of 3 tokens, section 2 is missing entirely
+    assert Benchmark._section_agreement(other, base) == pytest.approx((2 / 3) / 2)
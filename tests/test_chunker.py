@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from usb_pd_parser.chunker import Chunker
+from usb_pd_parser.config import Config
+from usb_pd_parser.validator import Validator
+
+
+def _section(text: str, sec_id: str = "6.4") -> dict:
+    return {
+        "doc_title": "USB PD Spec",
+        "section_id": sec_id,
+        "title": "Protocol Layer",
+        "full_path": f"{sec_id} Protocol Layer",
+        "page": 120,
+        "level": sec_id.count(".") + 1,
+        "parent_id": None,
+        "tags": [],
+        "text": text,
+    }
+
+
+def test_chunks_are_bounded_overlapping_and_deterministic():
+    cfg = Config()
+    cfg.chunk_max_chars = 100
+    cfg.chunk_overlap_chars = 40
+    sentences = [f"Sentence number {i} describes a message." for i in range(10)]
+    section = _section(" ".join(sentences))
+
+    chunks = Chunker(cfg).extract([section])
+
+    assert len(chunks) > 1
+    assert all(len(c["text"]) <= cfg.chunk_max_chars for c in chunks)
+    assert all(c["section_id"] == "6.4" and c["full_path"] == "6.4 Protocol Layer" for c in chunks)
+    assert [c["chunk_index"] for c in chunks] == list(range(len(chunks)))
+    # every chunk starts on a sentence boundary and consecutive chunks share a sentence
+    assert all(c["text"].startswith("Sentence") for c in chunks)
+    assert chunks[0]["text"].split(". ")[-1].rstrip(".") in chunks[1]["text"]
+    # all sentences are covered
+    joined = " ".join(c["text"] for c in chunks)
+    assert all(s in joined for s in sentences)
+    # ids are stable across runs
+    assert [c["chunk_id"] for c in Chunker(cfg).extract([section])] == [c["chunk_id"] for c in chunks]
+
+
+def test_long_sentence_is_hard_split_and_embeddings_batched():
+    cfg = Config()
+    cfg.chunk_max_chars = 20
+    cfg.chunk_overlap_chars = 0
+    cfg.embed_batch_size = 2
+    calls = []
+
+    def embed(texts):
+        calls.append(len(texts))
+        return [[float(len(t))] for t in texts]
+
+    chunks = Chunker(cfg, embed_fn=embed).extract([_section("word " * 30)])
+
+    assert all(len(c["text"]) <= 20 for c in chunks)
+    assert all(c["embedding"] == [float(len(c["text"]))] for c in chunks)
+    assert max(calls) <= 2 and sum(calls) == len(chunks)
+
+
+def test_repeated_text_gets_distinct_chunk_ids():
+    cfg = Config()
+    cfg.chunk_max_chars = 40
+    cfg.chunk_overlap_chars = 0
+    section = _section("This field is Reserved. Shall be zero. " * 4)
+    chunks = Chunker(cfg).extract([section])
+
+    assert len(chunks) == 4
+    assert len({c["chunk_id"] for c in chunks}) == 4
+    assert [c["chunk_id"] for c in Chunker(cfg).extract([section])] == [c["chunk_id"] for c in chunks]
+
+
+def test_validator_checks_chunk_rows():
+    cfg = Config()
+    cfg.chunk_max_chars = 40
+    chunks = Chunker(cfg).extract([_section("Sentence one is here. Sentence two is here.")])
+    bad = {**chunks[0], "chunk_index": -1}
+
+    results = Validator().validate([], [], chunks=iter(chunks + [bad]))
+
+    assert results["summary"]["chunks_count"] == len(chunks) + 1
+    assert [f["id"] for f in results["chunk_schema_failures"]] == [bad["chunk_id"]]
+    assert results["duplicate_chunk_ids"] == [bad["chunk_id"]]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from usb_pd_parser.config import Config
+from usb_pd_parser.distributed import Coordinator, FileQueue, Worker
+from usb_pd_parser.pdf_document import PDFDocument
+from usb_pd_parser.pipeline import Pipeline
+
+
+class _MockPDF(PDFDocument):
+    def __init__(self, pages):
+        self._pages = pages
+
+    def num_pages(self) -> int:
+        return len(self._pages)
+
+    def load_all_text(self):
+        return self._pages
+
+    def load_pages_text(self, pages=None):
+        if pages is None:
+            return self._pages
+        return [self._pages[p - 1] for p in pages]
+
+
+PAGES = [
+    "Contents\n1 Introduction . . . . . . 2\n2 Overview . . . . . . 3\n2.1 Detail . . . . . . 5\n3 Annex . . . . . . 6",
+    "Page 2 - Intro text. Table 1-1",
+    "Page 3 - Overview text. Table 2-1",
+    "Page 4 - More overview. Figure 2-1",
+    "Page 5 - Detail text. Figure 2-2",
+    "Page 6 - Annex text. Table 3-1",
+    "Page 7 - Annex end.",
+]
+
+
+def test_sharded_run_survives_dead_worker_and_matches_pipeline(tmp_path: Path, monkeypatch):
+    pdf = _MockPDF(PAGES)
+    opened = []
+    monkeypatch.setattr("usb_pd_parser.distributed.PDFDocument", lambda path: opened.append(path) or pdf)
+    monkeypatch.setattr("usb_pd_parser.pipeline.PDFDocument", lambda path: pdf)
+    cfg = Config()
+    cfg.toc_start_hint = 1
+    cfg.toc_end_hint = 1
+    cfg.shard_pages = 2
+    cfg.lease_timeout_s = 60
+
+    queue = FileQueue(str(tmp_path / "queue"))
+    coordinator = Coordinator(cfg, queue)
+    source = tmp_path / "doc.pdf"
+    source.write_bytes(b"%PDF-1.4 mock")
+    job_id = coordinator.submit(str(source), "USB PD Spec", str(tmp_path / "sharded"))
+    assert len(queue.load_job(job_id)["unit_ids"]) == 4
+
+    # a worker claims a unit and dies without heartbeating
+    unit, lease = queue.claim("dead-node")
+    os.utime(lease, (0, 0))
+    assert queue.reap(cfg.lease_timeout_s, cfg.max_unit_attempts) == 1
+
+    assert Worker(cfg, queue, worker_id="node-a").run(idle_timeout_s=0) == 4
+    # workers open the copy inside the queue, never the coordinator's local path
+    shared = Path(queue.root, "jobs", f"{job_id}.pdf")
+    assert set(opened[1:]) == {str(shared)}
+    assert shared.read_bytes() == source.read_bytes()
+    outputs = coordinator.wait([job_id], poll_s=0, timeout_s=5)[job_id]
+    # a merged job leaves nothing behind in the queue
+    for sub in ("jobs", "done", "pending", "leased"):
+        assert not list(Path(queue.root, sub).iterdir()), sub
+
+    baseline = Pipeline(cfg).run(pdf_path="doc.pdf", doc_title="USB PD Spec", out_dir=str(tmp_path / "single"))
+    for key in ["toc", "sections", "metadata", "chunks"]:
+        assert Path(outputs[key]).read_text() == Path(baseline[key]).read_text()
+    assert not list(Path(queue.root, "leased").iterdir())
+
+
+class _CountingBackend:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = 0
+
+    def extract(self, path, pages, margin_pt=0.0):
+        self.calls += 1
+        for p in pages:
+            yield p, self.pages[p - 1], ([], [])
+
+
+def test_worker_opens_the_pdf_once_per_unit(tmp_path: Path, monkeypatch):
+    backend = _CountingBackend(PAGES)
+    monkeypatch.setattr("usb_pd_parser.pdf_document.get_backend", lambda name: backend)
+    monkeypatch.setattr(PDFDocument, "num_pages", lambda self: len(PAGES))
+    cfg = Config()
+    cfg.toc_start_hint = 1
+    cfg.toc_end_hint = 1
+    cfg.shard_pages = 4
+
+    queue = FileQueue(str(tmp_path / "queue"))
+    source = tmp_path / "doc.pdf"
+    source.write_bytes(b"%PDF-1.4 mock")
+    job_id = Coordinator(cfg, queue).submit(str(source), "USB PD Spec", str(tmp_path / "out"))
+    unit_ids = queue.load_job(job_id)["unit_ids"]
+
+    backend.calls = 0
+    assert Worker(cfg, queue).run(idle_timeout_s=0) == len(unit_ids)
+    assert backend.calls == len(unit_ids)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from usb_pd_parser.jsonl_index import IndexCache, JsonlIndex
+from usb_pd_parser.utils import read_jsonl, write_jsonl
+
+
+def test_indexed_jsonl_random_access(tmp_path: Path):
+    rows = [{"section_id": f"6.{i}", "text": f"Bereich {i} — µ"} for i in range(1, 8)]
+    path = tmp_path / "sections.jsonl"
+    write_jsonl(rows, path, index=True, index_key="section_id")
+
+    assert read_jsonl(path) == rows
+    index = JsonlIndex(str(path))
+    assert len(index) == 7
+    assert json.loads(index.row(0)) == rows[0]
+    assert [json.loads(r) for r in index.rows(2, 3)] == rows[2:5]
+    assert index.rows(6, 10) == [index.row(6)]
+    assert index.rows(7, 5) == []
+    assert json.loads(index.get("6.4")) == rows[3]
+    assert index.get("9.9") is None
+    index.close()
+
+
+def test_indexed_empty_jsonl(tmp_path: Path):
+    path = tmp_path / "metadata.jsonl"
+    write_jsonl([], path, index=True)
+    index = JsonlIndex(str(path))
+    assert len(index) == 0
+    assert index.rows(0, 10) == []
+
+
+def test_key_lookup_uses_sorted_table_and_cache_closes_evicted(tmp_path: Path):
+    rows = [{"chunk_id": f"{i:04x}" * 8, "text": str(i)} for i in range(50)][::-1]
+    paths = []
+    for name in ("a", "b"):
+        path = tmp_path / f"{name}.jsonl"
+        write_jsonl(rows, path, index=True, index_key="chunk_id")
+        paths.append(str(path))
+
+    cache = IndexCache(maxsize=1)
+    with cache.lease(paths[0]) as first:
+        assert all(json.loads(first.get(r["chunk_id"])) == r for r in rows)
+        assert first.get("f" * 32) is None and first.get("x" * 40) is None
+        # evicting an index that is still being read must not close it under the reader
+        with cache.lease(paths[1]) as second:
+            assert len(cache) == 1
+            assert first.row(0)
+        assert first._data is not None
+    assert first._data is None
+    cache.invalidate(tmp_path)
+    assert len(cache) == 0 and second._data is None
+
+
+def test_index_rejects_data_file_that_does_not_match_offsets(tmp_path: Path):
+    path = tmp_path / "chunks.jsonl"
+    write_jsonl([{"chunk_id": "a", "text": "x" * 100}], path, index=True, index_key="chunk_id")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["chunks.jsonl", "chunks.jsonl.keys", "chunks.jsonl.offsets"]
+
+    path.write_bytes(path.read_bytes()[:40])   # e.g. a rewrite still in progress
+    cache = IndexCache()
+    with pytest.raises(ValueError):
+        with cache.lease(str(path)):
+            pass
+    assert len(cache) == 0
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 from usb_pd_parser.config import Config
@@ -51,3 +52,161 @@ def test_pipeline_end_to_end_tmp(tmp_path: Path, monkeypatch):
     # Check files exist and not empty
     for k in ["toc", "sections", "metadata", "report"]:
         assert Path(out[k]).exists()
+
+
+def test_pipeline_emits_progress_events(tmp_path: Path, monkeypatch):
+    pages = [
+        "Contents\n1 Introduction . . . . . . . . . . . . 2\n2 Overview . . . . . . . . . . . . . . 3",
+        "Page 2 - Intro text.",
+        "Page 3 - Overview text.",
+    ]
+    monkeypatch.setattr("usb_pd_parser.pipeline.PDFDocument", lambda path: _MockPDF(pages))
+    cfg = Config()
+    cfg.toc_start_hint = 1
+    cfg.toc_end_hint = 1
+    events = []
+    Pipeline(cfg).run(
+        pdf_path="dummy.pdf",
+        doc_title="USB PD Spec",
+        out_dir=tmp_path.as_posix(),
+        progress=events.append,
+    )
+
+    stages = [e.stage for e in events]
+    for stage in ["extract_text", "toc", "sections", "metadata", "chunks", "validate"]:
+        assert stage in stages
+    assert stages[-1] == "done"
+    sections_done = [e for e in events if e.stage == "sections" and e.total]
+    assert sections_done[-1].done == sections_done[-1].total == 2
+
+
+def test_pipeline_partial_parse_loads_only_selected_pages(tmp_path: Path, monkeypatch):
+    pages = [
+        "Contents\n1 Introduction . . . . . . 2\n2 Overview . . . . . . 3\n2.1 Detail . . . . . . 4\n3 Annex . . . . . . 5",
+        "Page 2 - Intro text. Table 1-1",
+        "Page 3 - Overview text. Table 2-1",
+        "Page 4 - Detail text. Figure 2-2",
+        "Page 5 - Annex text. Table 3-1",
+    ]
+    pdf = _MockPDF(pages)
+    requested = []
+    load = pdf.load_pages_text
+
+    def _tracking_load(pages=None):
+        requested.append(list(pages) if pages is not None else None)
+        return load(pages)
+
+    pdf.load_pages_text = _tracking_load
+    monkeypatch.setattr("usb_pd_parser.pipeline.PDFDocument", lambda path: pdf)
+    cfg = Config()
+    cfg.toc_start_hint = 1
+    cfg.toc_end_hint = 1
+    out = Pipeline(cfg).run(
+        pdf_path="dummy.pdf",
+        doc_title="USB PD Spec",
+        out_dir=tmp_path.as_posix(),
+        section_filter=["2"],
+    )
+
+    sections = [json.loads(l) for l in Path(out["sections"]).read_text().splitlines()]
+    metadata = [json.loads(l) for l in Path(out["metadata"]).read_text().splitlines()]
+    assert [s["section_id"] for s in sections] == ["2", "2.1"]
+    assert sections[0]["text"] == "Page 3 - Overview text. Table 2-1"
+    assert sorted(m["page"] for m in metadata) == [3, 4]
+    assert None not in requested
+    assert {p for req in requested for p in req} == {1, 3, 4}
+
+
+class _MarginPDF(_MockPDF):
+    """Mock that also reports which lines a backend found in the margin bands."""
+
+    def __init__(self, pages, margins):
+        super().__init__(pages)
+        self._page_margins = dict(enumerate(margins, start=1))
+
+
+def test_pipeline_strips_running_headers_and_footers(tmp_path: Path, monkeypatch):
+    header = "USB Power Delivery Specification Revision 3.2, Version 1.1"
+    # a three-page ToC: its footers must be stripped before the ToC lines are parsed
+    body = ["Contents\n1 Introduction . . . . . . 4", "2 Overview . . . . . . 5", "3 Annex . . . . . . 8"]
+    body += ["Intro text. Table 1-1", "Overview text.", "More overview.", "Closing remarks.", "Annex text."]
+    pages = [f"{header}\n{text}\nPage {p}" for p, text in enumerate(body, start=1)]
+    margins = [([header], [f"Page {p}"]) for p in range(1, len(pages) + 1)]
+    monkeypatch.setattr("usb_pd_parser.pipeline.PDFDocument", lambda path: _MarginPDF(pages, margins))
+    cfg = Config()
+    cfg.toc_start_hint = 1
+    cfg.toc_end_hint = 3
+    out = Pipeline(cfg).run(pdf_path="dummy.pdf", doc_title="USB PD Spec", out_dir=tmp_path.as_posix())
+
+    sections = [json.loads(l) for l in Path(out["sections"]).read_text().splitlines()]
+    assert sections[0]["text"] == "Intro text. Table 1-1"
+    assert sections[1]["text"] == "Overview text. More overview. Closing remarks."
+    assert [s["section_id"] for s in sections] == ["1", "2", "3"]
+
+
+def test_pipeline_single_page_filter_keeps_running_lines_from_toc(tmp_path: Path, monkeypatch):
+    header = "USB Power Delivery Specification Revision 3.2, Version 1.1"
+    body = ["Contents\n1 Introduction . . . . . . 4", "2 Overview . . . . . . 5", "3 Annex . . . . . . 8"]
+    body += ["Intro text.", "Overview text.", "More overview.", "Closing remarks.", "Annex text."]
+    pages = [f"{header}\n{text}\nPage {p}" for p, text in enumerate(body, start=1)]
+    margins = [([header], [f"Page {p}"]) for p in range(1, len(pages) + 1)]
+    monkeypatch.setattr("usb_pd_parser.pipeline.PDFDocument", lambda path: _MarginPDF(pages, margins))
+    cfg = Config()
+    cfg.toc_start_hint = 1
+    cfg.toc_end_hint = 3
+    # section 3 spans one page: too few to re-learn from, so the ToC-page set must survive
+    out = Pipeline(cfg).run(
+        pdf_path="dummy.pdf", doc_title="USB PD Spec", out_dir=tmp_path.as_posix(), section_filter=["3"]
+    )
+
+    sections = [json.loads(l) for l in Path(out["sections"]).read_text().splitlines()]
+    assert [s["section_id"] for s in sections] == ["3"]
+    assert sections[0]["text"] == "Annex text."
+
+def test_pipeline_keeps_repeated_body_lines_outside_margins(tmp_path: Path, monkeypatch):
+    toc = "Contents\n" + "\n".join(f"{n} Topic {n} . . . . . . {n + 1}" for n in range(1, 12))
+    # every page ends with the same-shaped body line, but it lies outside the margin bands
+    pages = [toc] + [
+        f"Topic {n}\nBody text on page {n + 1}. Table {n}-1 is here. Figure {n}-2 shows it."
+        for n in range(1, 12)
+    ]
+    margins = [([], [])] * len(pages)
+    monkeypatch.setattr("usb_pd_parser.pipeline.PDFDocument", lambda path: _MarginPDF(pages, margins))
+    cfg = Config()
+    cfg.toc_start_hint = 1
+    cfg.toc_end_hint = 1
+    out = Pipeline(cfg).run(pdf_path="dummy.pdf", doc_title="USB PD Spec", out_dir=tmp_path.as_posix())
+
+    sections = [json.loads(l) for l in Path(out["sections"]).read_text().splitlines()]
+    metadata = Path(out["metadata"]).read_text().splitlines()
+    assert sections[0]["text"] == "Topic 1 Body text on page 2. Table 1-1 is here. Figure 1-2 shows it."
+    assert len(metadata) == 22
+
+
+class _OutlineMockPDF(_MockPDF):
+    def __init__(self, pages, outline):
+        super().__init__(pages)
+        self._bookmarks = outline
+        self.loaded = []
+
+    def outline(self):
+        assert not self.loaded, "ToC must be read before any page text"
+        return self._bookmarks
+
+    def load_pages_text(self, pages=None):
+        self.loaded.append(pages)
+        return super().load_pages_text(pages)
+
+
+def test_pipeline_reads_outline_toc_before_page_text(tmp_path: Path, monkeypatch):
+    pages = ["Cover", "Intro text.", "Overview text.", "Detail text.", "Annex text."]
+    outline = [(1, "1 Introduction", 2), (1, "2 Overview", 3), (2, "2.1 Detail", 4), (1, "3 Annex", 5)]
+    pdf = _OutlineMockPDF(pages, outline)
+    monkeypatch.setattr("usb_pd_parser.pipeline.PDFDocument", lambda path: pdf)
+    out = Pipeline(Config()).run(
+        pdf_path="dummy.pdf", doc_title="USB PD Spec", out_dir=tmp_path.as_posix(), section_filter=["2"]
+    )
+
+    sections = [json.loads(l) for l in Path(out["sections"]).read_text().splitlines()]
+    assert [s["section_id"] for s in sections] == ["2", "2.1"]
+    assert {p for req in pdf.loaded for p in req} == {3, 4}
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from usb_pd_parser.config import Config
 from usb_pd_parser.pdf_document import PDFDocument
+from usb_pd_parser.section_extractor import SectionExtractor
 from usb_pd_parser.toc_extractor import ToCExtractor
 
 
@@ -44,3 +45,48 @@ def test_toc_parses_and_preserves_parents():
     assert "2.1" in ids
     assert "2.1.1" in ids
     assert "2.1.1.1" in ids
+
+
+class _OutlinePDF(_MockPDF):
+    def __init__(self, pages, outline):
+        super().__init__(pages)
+        self._bookmarks = outline
+
+    def outline(self):
+        return self._bookmarks
+
+    def load_pages_text(self, pages=None):
+        raise AssertionError("outline path must not extract page text")
+
+
+def test_toc_from_outline_uses_exact_pages_without_page_text():
+    outline = [
+        (1, "Revision History", 2),
+        (1, "1 Introduction", 10),
+        (1, "6 Protocol Layer", 120),
+        (2, "6.4 Message Types", 135),
+        (3, "6.4.1 Control Message", 136),
+        (3, "6.4.2 Data Message", None),
+    ]
+    pdf = _OutlinePDF(["x"] * 200, outline)
+    extractor = ToCExtractor(Config())
+    toc = extractor.extract(pdf, "Doc")
+
+    assert extractor.source == "outline"
+    assert [(t["section_id"], t["page"]) for t in toc] == [
+        ("1", 10), ("6", 120), ("6.4", 135), ("6.4.1", 136)
+    ]
+    assert toc[3]["title"] == "Control Message" and toc[3]["parent_id"] == "6.4"
+
+
+def test_outline_parent_synthesized_at_first_child_page():
+    outline = [(1, "5 Power Supply", 100), (2, "6.1 Overview", 120), (2, "6.2 Messages", 130)]
+    pdf = _OutlinePDF(["x"] * 200, outline)
+    toc = ToCExtractor(Config()).extract_from_outline(pdf, "Doc")
+
+    assert [(t["section_id"], t["page"]) for t in toc] == [
+        ("5", 100), ("6", 120), ("6.1", 120), ("6.2", 130)
+    ]
+    spans = {e["section_id"]: (start, end) for e, start, end in SectionExtractor().spans(pdf, toc)}
+    assert spans["5"] == (100, 119)
+    assert spans["6"] == (120, 120)
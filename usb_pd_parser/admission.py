@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from .config import Config
+from .preflight import PreflightReport
+
+try:  # POSIX only; elsewhere the memory budget is advisory
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+
+class BudgetExceeded(RuntimeError):
+    """A job ran past its time or memory budget and was stopped."""
+
+
+class JobCancelled(RuntimeError):
+    """A job was cancelled by the client while queued or running."""
+
+
+@dataclass
+class JobBudget:
+    time_s: float
+    memory_mb: int
+
+
+@dataclass
+class AdmissionDecision:
+    admitted: bool
+    lane: str = ""
+    reason: str = ""
+    status_code: int = 200   # HTTP status to surface when not admitted
+    est_seconds: float = 0.0
+    est_memory_mb: int = 0
+    budget: Optional[JobBudget] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class AdmissionController:
+    """Turns a preflight report into admit/reject + lane, and meters lane concurrency."""
+
+    cfg: Config
+    _slots: Dict[str, threading.Semaphore] = field(init=False)
+    _queued: Dict[str, int] = field(init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self) -> None:
+        self._slots = {lane: threading.Semaphore(n) for lane, n in self.cfg.lane_slots.items()}
+        self._queued = {lane: 0 for lane in self.cfg.lane_slots}
+
+    def decide(self, report: PreflightReport, backend: str) -> AdmissionDecision:
+        cfg = self.cfg
+        if report.encrypted:
+            return AdmissionDecision(False, reason="PDF is encrypted", status_code=422)
+        if report.error or report.num_pages == 0:
+            return AdmissionDecision(False, reason=report.error or "PDF has no pages", status_code=422)
+        if report.file_size > cfg.max_upload_mb * 1024 * 1024:
+            return AdmissionDecision(
+                False, reason=f"file exceeds {cfg.max_upload_mb} MB", status_code=413
+            )
+        if report.num_pages > cfg.max_pages:
+            return AdmissionDecision(
+                False, reason=f"{report.num_pages} pages exceeds limit of {cfg.max_pages}", status_code=413
+            )
+        if not report.has_text_layer:
+            return AdmissionDecision(
+                False, reason="PDF has no text layer (scanned?); OCR is not supported", status_code=422
+            )
+
+        est_seconds = report.num_pages * cfg.est_seconds_per_page.get(backend, 0.15)
+        est_memory = int(cfg.est_base_memory_mb + report.num_pages * cfg.est_memory_mb_per_page)
+        large = report.num_pages > cfg.large_job_pages or est_memory > cfg.lane_memory_mb["standard"]
+        lane = "large" if large else "standard"
+        if est_memory > cfg.lane_memory_mb[lane]:
+            return AdmissionDecision(
+                False,
+                lane=lane,
+                reason=f"estimated {est_memory} MB exceeds the {lane} lane budget",
+                status_code=413,
+                est_seconds=est_seconds,
+                est_memory_mb=est_memory,
+            )
+        budget = JobBudget(
+            time_s=min(cfg.job_max_time_s, max(cfg.job_min_time_s, est_seconds * cfg.job_time_slack)),
+            memory_mb=cfg.lane_memory_mb[lane],
+        )
+        return AdmissionDecision(
+            True, lane=lane, est_seconds=round(est_seconds, 1), est_memory_mb=est_memory, budget=budget
+        )
+
+    def enqueue(self, lane: str) -> bool:
+        """Reserve a queue place; False when the lane's backlog is full."""
+        with self._lock:
+            if self._queued[lane] >= self.cfg.lane_max_queued[lane]:
+                return False
+            self._queued[lane] += 1
+            return True
+
+    def wait_for_slot(self, lane: str, cancelled: threading.Event, poll_s: float = 0.25) -> bool:
+        """Block until a run slot frees up; False if cancelled while queued."""
+        try:
+            while not self._slots[lane].acquire(timeout=poll_s):
+                if cancelled.is_set():
+                    return False
+            if cancelled.is_set():
+                self._slots[lane].release()
+                return False
+            return True
+        finally:
+            with self._lock:
+                self._queued[lane] -= 1
+
+    def release(self, lane: str) -> None:
+        self._slots[lane].release()
+
+    def queued(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._queued)
+
+
+def run_with_budget(
+    target: Callable[..., Any],
+    kwargs: Dict[str, Any],
+    budget: JobBudget,
+    on_event: Callable[[Dict], None],
+    cancelled: Optional[threading.Event] = None,
+    poll_s: float = 0.25,
+) -> Any:
+    """Run ``target(progress=..., **kwargs)`` in a child process under ``budget``.
+
+    The child gets a hard address-space limit; the parent enforces the wall-clock
+    deadline and cancellation by terminating it. Progress events are relayed to
+    ``on_event``. Raises BudgetExceeded, JobCancelled, or RuntimeError on failure.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    events = ctx.Queue()
+    proc = ctx.Process(
+        target=_budgeted_child, args=(target, kwargs, budget.memory_mb, events), daemon=True
+    )
+    proc.start()
+    deadline = time.monotonic() + budget.time_s
+    try:
+        while True:
+            if cancelled is not None and cancelled.is_set():
+                raise JobCancelled("cancelled")
+            if time.monotonic() > deadline:
+                raise BudgetExceeded(f"time budget of {budget.time_s:.0f}s exceeded")
+            try:
+                kind, payload = events.get(timeout=poll_s if proc.is_alive() else 1.0)
+            except queue.Empty:
+                if not proc.is_alive():
+                    proc.join()
+                    if proc.exitcode is not None and proc.exitcode < 0:
+                        # killed by a signal: the usual outcome of hitting RLIMIT_AS in native code
+                        raise BudgetExceeded(
+                            f"job process killed (signal {-proc.exitcode}); "
+                            f"likely over its {budget.memory_mb} MB memory budget"
+                        )
+                    raise RuntimeError(f"job process exited unexpectedly (exit code {proc.exitcode})")
+                continue
+            if kind == "progress":
+                on_event(payload)
+            elif kind == "result":
+                return payload
+            elif kind == "memory":
+                raise BudgetExceeded(payload)
+            else:
+                raise RuntimeError(payload)
+    finally:
+        if proc.is_alive():
+            proc.terminate()
+        proc.join(timeout=5)
+        if proc.is_alive():
+            proc.kill()
+            proc.join()
+        events.close()
+
+
+def _budgeted_child(target: Callable[..., Any], kwargs: Dict[str, Any], memory_mb: int, events: Any) -> None:
+    if resource is not None and memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    try:
+        result = target(progress=lambda e: events.put(("progress", e.to_dict())), **kwargs)
+        events.put(("result", result))
+    except MemoryError:
+        events.put(("memory", f"memory budget of {memory_mb} MB exceeded"))
+    except Exception as e:
+        events.put(("error", f"{type(e).__name__}: {e}"))
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import importlib.util
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Sequence, Tuple, Type
+
+from .utils import split_lines
+
+# Lines lying wholly inside the top and bottom margin bands of a page
+Margins = Tuple[List[str], List[str]]
+# (1-indexed page, text, margin lines); margins are ([], []) when margin_pt is 0
+PageText = Tuple[int, str, Margins]
+
+NO_MARGINS: Margins = ([], [])
+
+
+class TextBackend(ABC):
+    """Extracts text for a set of pages from one PDF file."""
+
+    name: str = ""
+    requires: str = ""   # importable module that must be installed
+
+    @abstractmethod
+    def extract(self, path: str, pages: Sequence[int], margin_pt: float = 0.0) -> Iterator[PageText]:
+        """Yield (page, text, margins) for ``pages`` (1-indexed, ascending).
+
+        ``margins`` holds the text lines that sit entirely within ``margin_pt`` of
+        the top and bottom page edges; running header/footer detection uses them.
+        """
+
+
+class PdfplumberBackend(TextBackend):
+    """Reference backend: best layout fidelity."""
+
+    name = "pdfplumber"
+    requires = "pdfplumber"
+
+    def extract(self, path: str, pages: Sequence[int], margin_pt: float = 0.0) -> Iterator[PageText]:
+        import pdfplumber
+
+        with pdfplumber.open(path) as pdf:
+            for p in pages:
+                page = pdf.pages[p - 1]
+                margins = NO_MARGINS
+                if margin_pt > 0:
+                    x0, top, x1, bottom = page.bbox
+                    band = min(margin_pt, (bottom - top) / 2)
+                    margins = (
+                        split_lines(page.within_bbox((x0, top, x1, top + band)).extract_text()),
+                        split_lines(page.within_bbox((x0, bottom - band, x1, bottom)).extract_text()),
+                    )
+                yield p, page.extract_text() or "", margins
+
+
+class PdfminerBackend(TextBackend):
+    """pdfminer.six layout analysis with LAParams tuned for single-column specs."""
+
+    name = "pdfminer"
+    requires = "pdfminer"
+
+    def extract(self, path: str, pages: Sequence[int], margin_pt: float = 0.0) -> Iterator[PageText]:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LAParams, LTTextContainer, LTTextLine
+
+        # boxes_flow=None skips the costly reading-order clustering
+        laparams = LAParams(line_margin=0.5, char_margin=2.0, word_margin=0.1, boxes_flow=None)
+        ordered = sorted(pages)
+        layouts = extract_pages(path, page_numbers=[p - 1 for p in ordered], laparams=laparams)
+        # pdfminer yields requested pages in document order
+        for p, layout in zip(ordered, layouts):
+            boxes = sorted(
+                (el for el in layout if isinstance(el, LTTextContainer)), key=lambda el: -el.y1
+            )
+            margins = NO_MARGINS
+            if margin_pt > 0:
+                band = min(margin_pt, layout.height / 2)
+                lines = [ln for el in boxes for ln in el if isinstance(ln, LTTextLine)]
+                # PDF space: y grows upwards from the bottom edge
+                margins = (
+                    split_lines("\n".join(ln.get_text() for ln in lines if ln.y0 >= layout.y1 - band)),
+                    split_lines("\n".join(ln.get_text() for ln in lines if ln.y1 <= layout.y0 + band)),
+                )
+            yield p, "".join(el.get_text() for el in boxes).strip(), margins
+
+
+class PdfiumBackend(TextBackend):
+    """PDFium via pypdfium2 (ships with pdfplumber): native and much faster."""
+
+    name = "pdfium"
+    requires = "pypdfium2"
+
+    def extract(self, path: str, pages: Sequence[int], margin_pt: float = 0.0) -> Iterator[PageText]:
+        import pypdfium2 as pdfium
+
+        doc = pdfium.PdfDocument(path)
+        try:
+            for p in pages:
+                page = doc[p - 1]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range().replace("\r\n", "\n")
+                margins = NO_MARGINS
+                if margin_pt > 0:
+                    width, height = page.get_size()
+                    band = min(margin_pt, height / 2)
+                    margins = (
+                        split_lines(textpage.get_text_bounded(0, height - band, width, height)),
+                        split_lines(textpage.get_text_bounded(0, 0, width, band)),
+                    )
+                textpage.close()
+                page.close()
+                yield p, text, margins
+        finally:
+            doc.close()
+
+
+class PymupdfBackend(TextBackend):
+    """MuPDF via PyMuPDF, when installed; fastest."""
+
+    name = "pymupdf"
+    requires = "fitz"
+
+    def extract(self, path: str, pages: Sequence[int], margin_pt: float = 0.0) -> Iterator[PageText]:
+        import fitz
+
+        with fitz.open(path) as doc:
+            for p in pages:
+                page = doc[p - 1]
+                margins = NO_MARGINS
+                if margin_pt > 0:
+                    r = page.rect
+                    band = min(margin_pt, r.height / 2)
+                    margins = (
+                        split_lines(page.get_text(clip=fitz.Rect(r.x0, r.y0, r.x1, r.y0 + band))),
+                        split_lines(page.get_text(clip=fitz.Rect(r.x0, r.y1 - band, r.x1, r.y1))),
+                    )
+                yield p, page.get_text(), margins
+
+
+BACKENDS: Dict[str, Type[TextBackend]] = {
+    b.name: b for b in (PdfplumberBackend, PdfminerBackend, PdfiumBackend, PymupdfBackend)
+}
+
+
+def available_backends() -> List[str]:
+    return [name for name, cls in BACKENDS.items() if importlib.util.find_spec(cls.requires)]
+
+
+def get_backend(name: str) -> TextBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend {name!r}; choose from {', '.join(BACKENDS)}")
+    if name not in available_backends():
+        raise ValueError(f"PDF backend {name!r} needs the '{BACKENDS[name].requires}' package")
+    return BACKENDS[name]()
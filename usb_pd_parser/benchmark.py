@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+
+from .backends import available_backends, get_backend
+from .config import Config
+from .pdf_document import PDFDocument
+from .pipeline import Pipeline
+from .section_extractor import SectionExtractor
+from .toc_extractor import ToCExtractor
+
+BASELINE = "pdfplumber"
+
+
+@dataclass
+class BackendResult:
+    pdf: str
+    backend: str
+    pages: int
+    seconds: float
+    pages_per_sec: float
+    toc_entries: int
+    toc_agreement: Optional[float] = None       # Jaccard of (section_id, page) vs. baseline
+    section_agreement: Optional[float] = None   # mean per-section token Jaccard vs. baseline
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class Benchmark:
+    cfg: Config
+
+    def run(
+        self, pdf_paths: Sequence[str], backends: Sequence[str], max_pages: Optional[int] = None
+    ) -> List[BackendResult]:
+        """Time each backend on the same pages and score ToC/section agreement with pdfplumber."""
+        results: List[BackendResult] = []
+        for path in pdf_paths:
+            runs: Dict[str, Dict] = {}
+            # the baseline always runs first so every other backend can be scored against it
+            for backend in [BASELINE] + [b for b in backends if b != BASELINE]:
+                runs[backend] = self._run_one(path, backend, max_pages)
+            base = runs[BASELINE]
+            for backend, run in runs.items():
+                if backend not in backends:
+                    continue
+                result = run["result"]
+                result.toc_agreement = round(
+                    _jaccard(self._toc_keys(run["toc"]), self._toc_keys(base["toc"])), 4
+                )
+                if run["sections"] is not None:
+                    result.section_agreement = round(
+                        self._section_agreement(run["sections"], base["sections"]), 4
+                    )
+                results.append(result)
+        return results
+
+    def _run_one(self, path: str, backend: str, max_pages: Optional[int]) -> Dict:
+        pdf = PDFDocument(path)
+        pdf.backend = backend
+        pdf.margin_pt = self.cfg.running_lines_margin_pt
+        total = pdf.num_pages() if max_pages is None else min(max_pages, pdf.num_pages())
+
+        # timed pass: plain text only, the one workload every backend shares
+        started = time.perf_counter()
+        for _ in get_backend(backend).extract(path, range(1, total + 1)):
+            pass
+        seconds = time.perf_counter() - started
+
+        # untimed pass with margin bands, so scoring sees the pipeline's usual page models
+        pdf.load_pages_text(range(1, total + 1))
+
+        # text-derived ToC: the outline would be identical for every backend
+        Pipeline(self.cfg).learn_running_lines(pdf, range(1, total + 1))
+        toc = ToCExtractor(self.cfg).extract_from_text(pdf, "benchmark")
+        toc = [e for e in toc if e["page"] <= total]
+        sections = SectionExtractor().extract(pdf, toc) if total == pdf.num_pages() else None
+        return {
+            "toc": toc,
+            "sections": sections,
+            "result": BackendResult(
+                pdf=path,
+                backend=backend,
+                pages=total,
+                seconds=round(seconds, 3),
+                pages_per_sec=round(total / seconds, 2) if seconds else 0.0,
+                toc_entries=len(toc),
+            ),
+        }
+
+    @staticmethod
+    def _toc_keys(toc: List[Dict]) -> set:
+        return {(e["section_id"], e["page"]) for e in toc}
+
+    @staticmethod
+    def _section_agreement(sections: List[Dict], baseline: List[Dict]) -> float:
+        base = {s["section_id"]: set(s["text"].split()) for s in baseline}
+        scores = [
+            _jaccard(set(s["text"].split()), base[s["section_id"]])
+            for s in sections
+            if s["section_id"] in base
+        ]
+        # sections missing on either side count as total disagreement
+        misses = len(set(base) ^ {s["section_id"] for s in sections})
+        n = len(scores) + misses
+        return sum(scores) / n if n else 1.0
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare PDF text-extraction backends")
+    parser.add_argument("--pdf", required=True, action="append", help="PDF path (repeatable)")
+    parser.add_argument(
+        "--backends", default=None, help="Comma-separated backends (default: all installed)"
+    )
+    parser.add_argument(
+        "--max_pages", type=int, default=None, help="Only time the first N pages (skips section scoring)"
+    )
+    parser.add_argument("--json", default=None, help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    backends = available_backends()
+    if args.backends:
+        backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if not backends:
+        parser.error("--backends names no backend")
+    for name in backends:
+        try:
+            get_backend(name)
+        except ValueError as e:
+            parser.error(str(e))
+    results = Benchmark(Config()).run(args.pdf, backends, max_pages=args.max_pages)
+
+    print(f"{'backend':<12}{'pages':>7}{'sec':>9}{'pages/s':>10}{'toc':>6}{'toc_agree':>11}{'sec_agree':>11}  pdf")
+    for r in results:
+        print(
+            f"{r.backend:<12}{r.pages:>7}{r.seconds:>9.2f}{r.pages_per_sec:>10.1f}{r.toc_entries:>6}"
+            f"{r.toc_agreement:>11.3f}{_fmt(r.section_agreement):>11}  {r.pdf}"
+        )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional
+
+from .config import Config
+
+EmbedFn = Callable[[List[str]], List[List[float]]]
+
+
+@dataclass
+class Chunker:
+    cfg: Config
+    embed_fn: Optional[EmbedFn] = None
+
+    # ---------- public API ----------
+    def iter_chunks(self, sections: Iterable[Dict]) -> Iterator[Dict]:
+        """Stream size-bounded, overlapping chunks; one section is held in memory at a time."""
+        chunks = self._iter_raw_chunks(sections)
+        if self.embed_fn is None:
+            yield from chunks
+        else:
+            yield from self._embed_batched(chunks)
+
+    def extract(self, sections: Iterable[Dict]) -> List[Dict]:
+        return list(self.iter_chunks(sections))
+
+    # ---------- chunking ----------
+    def _iter_raw_chunks(self, sections: Iterable[Dict]) -> Iterator[Dict]:
+        for section in sections:
+            seen: Counter = Counter()   # repeated boilerplate within a section needs distinct ids
+            for idx, text in enumerate(self._split_text(section.get("text") or "")):
+                occurrence = seen[text]
+                seen[text] += 1
+                yield {
+                    "doc_title": section["doc_title"],
+                    "chunk_id": self._chunk_id(section, text, occurrence),
+                    "section_id": section["section_id"],
+                    "full_path": section["full_path"],
+                    "page": section["page"],
+                    "chunk_index": idx,
+                    "text": text,
+                }
+
+    def _split_text(self, text: str) -> Iterator[str]:
+        """Greedy sentence packing with a sliding window of trailing sentences as overlap."""
+        max_chars = max(1, self.cfg.chunk_max_chars)
+        overlap = max(0, min(self.cfg.chunk_overlap_chars, max_chars // 2))
+
+        window: Deque[str] = deque()
+        size = 0  # == len(" ".join(window))
+        for sent in self._sentences(text, max_chars):
+            if window and size + 1 + len(sent) > max_chars:
+                yield " ".join(window)
+                # keep the tail of the window that fits in the overlap budget
+                while window and (size > overlap or size + 1 + len(sent) > max_chars):
+                    size -= len(window.popleft()) + (1 if window else 0)
+            size += len(sent) + (1 if window else 0)
+            window.append(sent)
+        if window:
+            yield " ".join(window)
+
+    @staticmethod
+    def _sentences(text: str, max_chars: int) -> Iterator[str]:
+        """Yield sentences, hard-splitting on word boundaries any that exceed max_chars."""
+        for sent in re.split(r"(?<=[.!?;])\s+(?=[A-Z0-9(\"'])", text.strip()):
+            sent = sent.strip()
+            if not sent:
+                continue
+            if len(sent) <= max_chars:
+                yield sent
+                continue
+            piece = ""
+            for word in sent.split():
+                while len(word) > max_chars:
+                    if piece:
+                        yield piece
+                        piece = ""
+                    yield word[:max_chars]
+                    word = word[max_chars:]
+                if piece and len(piece) + 1 + len(word) > max_chars:
+                    yield piece
+                    piece = word
+                else:
+                    piece = f"{piece} {word}" if piece else word
+            if piece:
+                yield piece
+
+    @staticmethod
+    def _chunk_id(section: Dict, text: str, occurrence: int = 0) -> str:
+        """Deterministic content hash: unchanged chunks keep their id across re-ingestion.
+
+        ``occurrence`` counts earlier chunks with identical text in the same section,
+        so repeated text still gets one id per chunk.
+        """
+        h = hashlib.sha256()
+        for part in (section["doc_title"], section["section_id"], text, str(occurrence)):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()[:32]
+
+    # ---------- embeddings ----------
+    def _embed_batched(self, chunks: Iterator[Dict]) -> Iterator[Dict]:
+        assert self.embed_fn is not None
+        batch_size = max(1, self.cfg.embed_batch_size)
+        batch: List[Dict] = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                yield from self._embed(batch)
+                batch = []
+        if batch:
+            yield from self._embed(batch)
+
+    def _embed(self, batch: List[Dict]) -> List[Dict]:
+        assert self.embed_fn is not None
+        vectors = self.embed_fn([c["text"] for c in batch])
+        if len(vectors) != len(batch):
+            raise ValueError(
+                f"embed_fn returned {len(vectors)} vectors for {len(batch)} chunks"
+            )
+        for chunk, vec in zip(batch, vectors):
+            chunk["embedding"] = [float(x) for x in vec]
+        return batch
@@ -10,6 +10,15 @@ class Config:
     toc_start_hint: Optional[int] = None
     toc_end_hint: Optional[int] = None
 
+    # Text-extraction backend: pdfplumber, pdfminer, pdfium or pymupdf (see backends.py)
+    pdf_backend: str = "pdfplumber"
+
+    # ToC source: "auto" (PDF outline, else ToC pages), "outline" or "text"
+    toc_source: str = "auto"
+    toc_outline_min_entries: int = 3
+    # Also parse the ToC pages and log disagreements with the outline
+    toc_cross_check: bool = False
+
     # Fallback pages to scan when auto-detect fails
     toc_default_pages: int = 40
     max_scan_pages: int = 120
@@ -34,10 +43,48 @@ class Config:
 
     metadata_regexes: Dict[str, str] = field(init=False)
 
+    # Running header/footer detection: lines inside the top/bottom margin bands
+    # (margin_pt from the page edge) that recur on at least min_ratio of an evenly
+    # spaced page sample are stripped (0 pages disables)
+    running_lines_sample_pages: int = 24
+    running_lines_edge_lines: int = 2
+    running_lines_min_ratio: float = 0.5
+    running_lines_margin_pt: float = 54.0
+
+    # Chunking (vector-store export)
+    chunk_max_chars: int = 1200
+    chunk_overlap_chars: int = 200
+    embed_batch_size: int = 32
+
+    # Progress events: minimum seconds between throttled updates
+    progress_interval_s: float = 0.5
+
+    # Distributed mode: pages per work unit and lease expiry for dead workers
+    shard_pages: int = 100
+    lease_timeout_s: float = 120.0
+    max_unit_attempts: int = 3
+
+    # Parse-service admission control and per-job budgets
+    max_upload_mb: int = 300
+    max_pages: int = 5000
+    large_job_pages: int = 800
+    lane_slots: Dict[str, int] = field(default_factory=lambda: {"standard": 4, "large": 1})
+    lane_max_queued: Dict[str, int] = field(default_factory=lambda: {"standard": 32, "large": 4})
+    lane_memory_mb: Dict[str, int] = field(default_factory=lambda: {"standard": 2048, "large": 6144})
+    est_seconds_per_page: Dict[str, float] = field(
+        default_factory=lambda: {"pdfplumber": 0.15, "pdfminer": 0.08, "pdfium": 0.01, "pymupdf": 0.01}
+    )
+    est_base_memory_mb: int = 400
+    est_memory_mb_per_page: float = 1.0
+    job_time_slack: float = 3.0
+    job_min_time_s: float = 120.0
+    job_max_time_s: float = 3600.0
+
     # Outputs
     toc_jsonl: str = "usb_pd_toc.jsonl"
     sections_jsonl: str = "usb_pd_spec.jsonl"
     metadata_jsonl: str = "usb_pd_metadata.jsonl"
+    chunks_jsonl: str = "usb_pd_chunks.jsonl"
     validation_report: str = "validation_report.xlsx"
 
     def __post_init__(self) -> None:
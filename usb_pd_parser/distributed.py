@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import socket
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import Config
+from .metadata_extractor import MetadataExtractor
+from .pdf_document import PDFDocument
+from .pipeline import Pipeline
+from .section_extractor import SectionExtractor
+from .toc_extractor import ToCExtractor
+from .utils import read_jsonl, write_jsonl
+
+logger = logging.getLogger("usb_pd_parser.distributed")
+
+
+@dataclass
+class WorkUnit:
+    unit_id: str
+    job_id: str
+    page_start: int
+    page_end: int
+    section_ids: List[str]
+    attempts: int = 0
+
+
+@dataclass
+class FileQueue:
+    """Work queue on a directory shared by all nodes (local disk, NFS, SMB, ...).
+
+    A unit moves pending/<unit>.json -> leased/<unit>@<worker>.json -> done/<unit>/.
+    Every transition is a rename, so exactly one worker wins a claim and a result
+    directory only ever appears complete. Leases are kept alive by touching the
+    lease file; the coordinator re-queues leases that stop being touched.
+    """
+
+    root: str
+
+    def __post_init__(self) -> None:
+        for sub in ("pending", "leased", "done", "failed", "jobs"):
+            Path(self.root, sub).mkdir(parents=True, exist_ok=True)
+
+    # ---------- jobs ----------
+    def put_job(self, job_id: str, manifest: Dict) -> None:
+        self._write_atomic(Path(self.root, "jobs", f"{job_id}.json"), manifest)
+
+    def load_job(self, job_id: str) -> Dict:
+        return json.loads(Path(self.root, "jobs", f"{job_id}.json").read_text(encoding="utf-8"))
+
+    def put_pdf(self, job_id: str, pdf_path: str) -> str:
+        """Place the job's PDF inside the queue so every node can open it; returns its queue-relative name."""
+        name = f"{job_id}.pdf"
+        dest = Path(self.root, "jobs", name)
+        tmp = dest.with_name(f".{name}.{uuid.uuid4().hex}.tmp")
+        try:
+            os.link(pdf_path, tmp)   # free when the PDF already lives on the shared filesystem
+        except OSError:
+            shutil.copyfile(pdf_path, tmp)
+        os.replace(tmp, dest)
+        return name
+
+    def job_pdf(self, job: Dict) -> Path:
+        """Resolve a manifest's PDF against this node's view of the queue root."""
+        return Path(self.root, "jobs", job["pdf"])
+
+    def remove_job(self, job_id: str, job: Dict) -> None:
+        """Drop a merged job's unit results, PDF copy and manifest (the manifest last)."""
+        for uid in job["unit_ids"]:
+            shutil.rmtree(self.result_dir(uid), ignore_errors=True)
+        self.job_pdf(job).unlink(missing_ok=True)
+        Path(self.root, "jobs", f"{job_id}.json").unlink(missing_ok=True)
+
+    # ---------- units ----------
+    def put(self, unit: WorkUnit) -> None:
+        self._write_atomic(Path(self.root, "pending", f"{unit.unit_id}.json"), asdict(unit))
+
+    def claim(self, worker_id: str) -> Optional[Tuple[WorkUnit, Path]]:
+        for path in sorted(Path(self.root, "pending").glob("*.json")):
+            lease = Path(self.root, "leased", f"{path.stem}@{worker_id}.json")
+            try:
+                # touch first so the lease never appears with a stale mtime
+                os.utime(path)
+                os.rename(path, lease)
+            except FileNotFoundError:
+                continue  # another worker won the race
+            return WorkUnit(**json.loads(lease.read_text(encoding="utf-8"))), lease
+        return None
+
+    def heartbeat(self, lease: Path) -> None:
+        try:
+            os.utime(lease)
+        except FileNotFoundError:
+            pass  # lease was reaped; finishing is still harmless
+
+    def staging_dir(self, unit: WorkUnit, worker_id: str) -> Path:
+        p = Path(self.root, "done", f".{unit.unit_id}@{worker_id}.tmp")
+        shutil.rmtree(p, ignore_errors=True)
+        p.mkdir(parents=True)
+        return p
+
+    def complete(self, staging: Path, unit: WorkUnit, lease: Path) -> None:
+        try:
+            os.rename(staging, self.result_dir(unit.unit_id))
+        except OSError:
+            # a re-leased copy of this unit finished first
+            shutil.rmtree(staging, ignore_errors=True)
+        lease.unlink(missing_ok=True)
+
+    def requeue(self, unit: WorkUnit, max_attempts: int, error: str) -> None:
+        if unit.attempts >= max_attempts:
+            self._write_atomic(
+                Path(self.root, "failed", f"{unit.unit_id}.json"), {**asdict(unit), "error": error}
+            )
+        else:
+            self.put(unit)
+
+    def reap(self, lease_timeout_s: float, max_attempts: int) -> int:
+        """Return expired leases (dead or stalled workers) to the pending queue."""
+        reaped = 0
+        now = time.time()
+        for lease in Path(self.root, "leased").glob("*.json"):
+            try:
+                if now - lease.stat().st_mtime <= lease_timeout_s:
+                    continue
+                held = Path(self.root, "pending", f".{lease.name}.reap")
+                os.rename(lease, held)
+            except FileNotFoundError:
+                continue  # completed or reaped concurrently
+            unit = WorkUnit(**json.loads(held.read_text(encoding="utf-8")))
+            held.unlink()
+            if self.result_dir(unit.unit_id).is_dir():
+                continue
+            unit.attempts += 1
+            logger.warning("Lease expired for %s (attempt %d)", unit.unit_id, unit.attempts)
+            self.requeue(unit, max_attempts, error="lease expired")
+            reaped += 1
+        return reaped
+
+    def result_dir(self, unit_id: str) -> Path:
+        return Path(self.root, "done", unit_id)
+
+    def failure(self, unit_id: str) -> Optional[Dict]:
+        p = Path(self.root, "failed", f"{unit_id}.json")
+        return json.loads(p.read_text(encoding="utf-8")) if p.exists() else None
+
+    @staticmethod
+    def _write_atomic(path: Path, data: Dict) -> None:
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+@dataclass
+class Worker:
+    cfg: Config
+    queue: FileQueue
+    worker_id: str = field(default_factory=lambda: f"{socket.gethostname()}-{os.getpid()}")
+
+    def run(self, idle_timeout_s: Optional[float] = None, poll_s: float = 0.5) -> int:
+        """Process units until the queue stays empty for ``idle_timeout_s`` (forever if None)."""
+        processed = 0
+        idle_since = time.monotonic()
+        while True:
+            claimed = self.queue.claim(self.worker_id)
+            if claimed is None:
+                if idle_timeout_s is not None and time.monotonic() - idle_since >= idle_timeout_s:
+                    return processed
+                time.sleep(poll_s)
+                continue
+            unit, lease = claimed
+            try:
+                self.process(unit, lease)
+            except Exception as e:
+                logger.exception("Worker %s failed on %s", self.worker_id, unit.unit_id)
+                unit.attempts += 1
+                self.queue.requeue(unit, self.cfg.max_unit_attempts, error=str(e))
+                lease.unlink(missing_ok=True)
+            processed += 1
+            idle_since = time.monotonic()
+
+    def process(self, unit: WorkUnit, lease: Path) -> None:
+        job = self.queue.load_job(unit.job_id)
+        pdf = PDFDocument(str(self.queue.job_pdf(job)))
+        pdf.backend = job["pdf_backend"]
+        pdf.margin_pt = self.cfg.running_lines_margin_pt
+        pdf.on_page = lambda done, total: self.queue.heartbeat(lease)
+        pdf.set_running_lines(job["running_lines"], self.cfg.running_lines_edge_lines)
+
+        extractor = SectionExtractor()
+        # one pass over the shard (plus the tail of its last section): backends reopen the
+        # PDF on every extract call, so per-section loading would reopen it per section
+        wanted = set(unit.section_ids)
+        last = max(
+            [end for e, _, end in extractor.spans(pdf, job["toc"]) if e["section_id"] in wanted],
+            default=unit.page_end,
+        )
+        pdf.load_pages_text(range(unit.page_start, max(last, unit.page_end) + 1))
+
+        sections = extractor.extract(pdf, job["toc"], section_ids=unit.section_ids)
+        metadata = MetadataExtractor(self.cfg).extract(
+            pdf, job["doc_title"], pages=range(unit.page_start, unit.page_end + 1)
+        )
+
+        staging = self.queue.staging_dir(unit, self.worker_id)
+        write_jsonl(sections, staging / "sections.jsonl")
+        write_jsonl(metadata, staging / "metadata.jsonl")
+        self.queue.complete(staging, unit, lease)
+
+
+@dataclass
+class Coordinator:
+    cfg: Config
+    queue: FileQueue
+
+    def submit(
+        self,
+        pdf_path: str,
+        doc_title: str,
+        out_dir: str,
+        toc_start: Optional[int] = None,
+        toc_end: Optional[int] = None,
+    ) -> str:
+        """Extract the ToC locally and enqueue one work unit per page shard."""
+        pdf = PDFDocument(pdf_path)
+        pdf.backend = self.cfg.pdf_backend
+        pdf.margin_pt = self.cfg.running_lines_margin_pt
+        pipeline = Pipeline(self.cfg)
+        toc = ToCExtractor(self.cfg, on_toc_pages=lambda p: pipeline.learn_running_lines(pdf, p)).extract(
+            pdf, doc_title, toc_start=toc_start, toc_end=toc_end
+        )
+        # after the ToC, so the outline path has the ToC before any page text is read
+        running = pipeline.learn_running_lines(pdf)
+        total = pdf.num_pages()
+        spans = SectionExtractor().spans(pdf, toc)
+
+        job_id = uuid.uuid4().hex
+        pdf_name = self.queue.put_pdf(job_id, pdf_path)
+        units: List[WorkUnit] = []
+        size = max(1, self.cfg.shard_pages)
+        for i, start in enumerate(range(1, total + 1, size)):
+            end = min(total, start + size - 1)
+            # a section belongs to the shard holding its first page
+            ids = [e["section_id"] for e, s, _ in spans if start <= min(s, total) <= end]
+            units.append(WorkUnit(f"{job_id}-{i:05d}", job_id, start, end, ids))
+
+        self.queue.put_job(
+            job_id,
+            {
+                "pdf": pdf_name,   # relative to <queue>/jobs; workers mount the queue elsewhere
+                "doc_title": doc_title,
+                "out_dir": out_dir,
+                "toc": toc,
+                "running_lines": running,
+                "pdf_backend": self.cfg.pdf_backend,
+                "unit_ids": [u.unit_id for u in units],
+            },
+        )
+        for unit in units:
+            self.queue.put(unit)
+        logger.info("Job %s: %d pages in %d units", job_id, total, len(units))
+        return job_id
+
+    def wait(
+        self, job_ids: List[str], poll_s: float = 0.5, timeout_s: Optional[float] = None
+    ) -> Dict[str, Dict[str, str]]:
+        """Reap dead leases until every job's units are done, then merge each job."""
+        remaining = list(job_ids)
+        outputs: Dict[str, Dict[str, str]] = {}
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        while True:
+            self.queue.reap(self.cfg.lease_timeout_s, self.cfg.max_unit_attempts)
+            for job_id in list(remaining):
+                unit_ids = self.queue.load_job(job_id)["unit_ids"]
+                for uid in unit_ids:
+                    failure = self.queue.failure(uid)
+                    if failure is not None:
+                        raise RuntimeError(f"Work unit {uid} failed: {failure.get('error')}")
+                if all(self.queue.result_dir(uid).is_dir() for uid in unit_ids):
+                    outputs[job_id] = self.merge(job_id)
+                    remaining.remove(job_id)
+            if not remaining:
+                return outputs
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Jobs still running: {', '.join(remaining)}")
+            time.sleep(poll_s)
+
+    def merge(self, job_id: str) -> Dict[str, str]:
+        """Concatenate unit shards into the usual pipeline outputs."""
+        job = self.queue.load_job(job_id)
+        sections: List[Dict] = []
+        metadata: List[Dict] = []
+        # units are in page order, so metadata stays page-ordered
+        for uid in job["unit_ids"]:
+            result = self.queue.result_dir(uid)
+            sections.extend(read_jsonl(result / "sections.jsonl"))
+            metadata.extend(read_jsonl(result / "metadata.jsonl"))
+        sections.sort(key=lambda e: tuple(int(x) for x in e["section_id"].split(".")))
+        out = Pipeline(self.cfg).write_outputs(job["toc"], sections, metadata, job["out_dir"])
+        self.queue.remove_job(job_id, job)
+        return out
+
+
+def _worker_main(cfg: Config, queue_root: str, idle_timeout_s: Optional[float]) -> None:
+    Worker(cfg, FileQueue(queue_root)).run(idle_timeout_s=idle_timeout_s)
+
+
+def run_local(
+    cfg: Config,
+    queue_root: str,
+    docs: List[Tuple[str, str, str]],
+    workers: int = 2,
+) -> Dict[str, Dict[str, str]]:
+    """Coordinator plus ``workers`` local processes standing in for nodes.
+
+    ``docs`` holds (pdf_path, doc_title, out_dir) triples.
+    """
+    queue = FileQueue(queue_root)
+    coordinator = Coordinator(cfg, queue)
+    job_ids = [coordinator.submit(pdf, title, out) for pdf, title, out in docs]
+    procs = [
+        multiprocessing.Process(target=_worker_main, args=(cfg, queue_root, None), daemon=True)
+        for _ in range(max(1, workers))
+    ]
+    for p in procs:
+        p.start()
+    try:
+        return coordinator.wait(job_ids)
+    finally:
+        for p in procs:
+            p.terminate()
+            p.join()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="USB-PD PDF parser: sharded coordinator/worker mode")
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    coord = sub.add_parser("coordinator", help="Shard documents, wait for workers, merge outputs")
+    coord.add_argument("--queue", required=True, help="Queue directory shared with workers")
+    coord.add_argument("--pdf", required=True, action="append", help="PDF path (repeatable)")
+    coord.add_argument("--doc_title", required=True, help="Document title")
+    coord.add_argument("--out_dir", default=".", help="Output directory (one subdir per PDF if several)")
+    coord.add_argument("--shard_pages", type=int, default=None, help="Pages per work unit")
+    coord.add_argument("--backend", default="pdfplumber", help="PDF text-extraction backend")
+    coord.add_argument("--local_workers", type=int, default=0, help="Also spawn N local worker processes")
+
+    work = sub.add_parser("worker", help="Pull and process work units from the queue")
+    work.add_argument("--queue", required=True, help="Queue directory shared with the coordinator")
+    work.add_argument("--idle_timeout", type=float, default=None, help="Exit after N idle seconds")
+    args = parser.parse_args()
+
+    cfg = Config()
+    if args.role == "worker":
+        n = Worker(cfg, FileQueue(args.queue)).run(idle_timeout_s=args.idle_timeout)
+        logger.info("Worker exiting after %d units", n)
+        return
+
+    cfg.pdf_backend = args.backend
+    if args.shard_pages:
+        cfg.shard_pages = args.shard_pages
+    docs = [
+        (pdf, args.doc_title, args.out_dir if len(args.pdf) == 1 else str(Path(args.out_dir, Path(pdf).stem)))
+        for pdf in args.pdf
+    ]
+    if args.local_workers:
+        outputs = run_local(cfg, args.queue, docs, workers=args.local_workers)
+    else:
+        coordinator = Coordinator(cfg, FileQueue(args.queue))
+        outputs = coordinator.wait([coordinator.submit(*d) for d in docs])
+    for job_id, out in outputs.items():
+        logger.info("Job %s done. Outputs:\n%s", job_id, "\n".join(f"{k}: {v}" for k, v in out.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import uuid
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Sidecar files written next to an indexed JSONL file:
+#   <name>.offsets  little-endian uint64 start offset of every row, plus the end of file
+#   <name>.keys     key table for the first row carrying each key: an 8-byte header
+#                   (KEYS_MAGIC, uint32 key width) then records sorted by key, each the
+#                   NUL-padded UTF-8 key followed by uint64 offset and uint64 length
+OFFSETS_SUFFIX = ".offsets"
+KEYS_SUFFIX = ".keys"
+KEYS_MAGIC = b"JKIX"
+_HEADER = struct.Struct("<4sI")
+_SPAN = struct.Struct("<QQ")
+_OFFSET = struct.Struct("<Q")
+
+
+def offsets_path(path: str | Path) -> Path:
+    p = Path(path)
+    return p.with_name(p.name + OFFSETS_SUFFIX)
+
+
+def keys_path(path: str | Path) -> Path:
+    p = Path(path)
+    return p.with_name(p.name + KEYS_SUFFIX)
+
+
+def _write_atomic(path: Path, write: Callable[[BinaryIO], None]) -> None:
+    # readers either see the previous sidecar or the complete new one, never a partial file
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def write_index(path: str | Path, offsets: array, keys: Optional[Dict[str, List[int]]]) -> None:
+    if sys.byteorder != "little":
+        offsets = array("Q", offsets)
+        offsets.byteswap()
+    # the offsets table is what marks a file as indexed, so it is replaced last
+    if keys is not None:
+        encoded = {k.encode("utf-8"): span for k, span in keys.items()}
+        width = max((len(k) for k in encoded), default=1)
+
+        def write_keys(f: BinaryIO) -> None:
+            f.write(_HEADER.pack(KEYS_MAGIC, width))
+            for k in sorted(encoded):
+                f.write(k.ljust(width, b"\0"))
+                f.write(_SPAN.pack(*encoded[k]))
+
+        _write_atomic(keys_path(path), write_keys)
+    else:
+        keys_path(path).unlink(missing_ok=True)
+    _write_atomic(offsets_path(path), offsets.tofile)
+
+
+@dataclass
+class JsonlIndex:
+    """Random access into a JSONL file written by ``write_jsonl(..., index=True)``.
+
+    The data, the offsets table and the key table are all memory-mapped, so
+    fetching row ``i`` reads two offsets and one byte range, and a key lookup is
+    a binary search over fixed-width records, regardless of file size. Rows are
+    returned as raw JSON bytes; callers decide whether to parse them.
+    """
+
+    path: str
+    _data: Optional[mmap.mmap] = field(default=None, init=False, repr=False)
+    _offsets: Optional[mmap.mmap] = field(default=None, init=False, repr=False)
+    _keys: Optional[mmap.mmap] = field(default=None, init=False, repr=False)
+    _key_width: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not offsets_path(self.path).exists():
+            raise FileNotFoundError(f"No offset index for {self.path}")
+        self._data = self._map(Path(self.path))
+        self._offsets = self._map(offsets_path(self.path))
+        # an offsets table for a different (e.g. half-written) data file would serve garbage
+        size = len(self._data) if self._data is not None else 0
+        table = len(self._offsets) if self._offsets is not None else 0
+        if table == 0 or table % 8 or _OFFSET.unpack_from(self._offsets, table - 8)[0] != size:
+            self.close()
+            raise ValueError(f"Offset index for {self.path} does not match the data file")
+
+    @staticmethod
+    def _map(path: Path) -> Optional[mmap.mmap]:
+        with path.open("rb") as f:
+            if path.stat().st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self._offsets) // 8 - 1 if self._offsets is not None else 0
+
+    def _span(self, i: int) -> Tuple[int, int]:
+        return _SPAN.unpack_from(self._offsets, 8 * i)
+
+    def row(self, i: int) -> bytes:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        start, end = self._span(i)
+        return self._data[start:end].rstrip(b"\n")
+
+    def rows(self, offset: int, limit: int) -> List[bytes]:
+        """Raw rows ``offset .. offset + limit - 1``; one contiguous slice of the data file."""
+        n = len(self)
+        offset = max(0, offset)
+        stop = min(n, offset + max(0, limit))
+        if offset >= stop:
+            return []
+        start, _ = self._span(offset)
+        _, end = self._span(stop - 1)
+        return self._data[start:end].splitlines()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Row whose index key equals ``key``; binary search over the mapped key table."""
+        if self._keys is None:
+            kp = keys_path(self.path)
+            if not kp.exists():
+                raise KeyError(f"{self.path} was not indexed by key")
+            self._keys = self._map(kp)
+            magic, self._key_width = _HEADER.unpack_from(self._keys, 0)
+            if magic != KEYS_MAGIC:
+                raise ValueError(f"{kp} is not a key table")
+        width = self._key_width
+        needle = key.encode("utf-8")
+        if len(needle) > width:
+            return None
+        needle = needle.ljust(width, b"\0")
+        record = width + _SPAN.size
+        lo, hi = 0, (len(self._keys) - _HEADER.size) // record
+        while lo < hi:
+            mid = (lo + hi) // 2
+            at = _HEADER.size + mid * record
+            probe = self._keys[at:at + width]
+            if probe < needle:
+                lo = mid + 1
+            elif probe > needle:
+                hi = mid
+            else:
+                start, length = _SPAN.unpack_from(self._keys, at + width)
+                return self._data[start:start + length]
+        return None
+
+    def close(self) -> None:
+        for m in (self._data, self._offsets, self._keys):
+            if m is not None:
+                m.close()
+        self._data = self._offsets = self._keys = None
+
+
+@dataclass
+class _CachedIndex:
+    index: JsonlIndex
+    users: int = 0
+
+
+@dataclass
+class IndexCache:
+    """Small LRU of open indexes that closes each one once evicted and no longer in use.
+
+    Use ``with cache.lease(path) as index:``; an index evicted (or invalidated)
+    while a request still reads it is closed when that request finishes.
+    """
+
+    maxsize: int = 16
+    _open: "OrderedDict[str, _CachedIndex]" = field(default_factory=OrderedDict, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    @contextmanager
+    def lease(self, path: str) -> Iterator[JsonlIndex]:
+        with self._lock:
+            entry = self._open.get(path)
+            if entry is None:
+                entry = self._open[path] = _CachedIndex(JsonlIndex(path))
+                while len(self._open) > self.maxsize:
+                    self._retire(self._open.popitem(last=False)[1])
+            else:
+                self._open.move_to_end(path)
+            entry.users += 1
+        try:
+            yield entry.index
+        finally:
+            with self._lock:
+                entry.users -= 1
+                if entry.users == 0 and self._open.get(path) is not entry:
+                    entry.index.close()
+
+    def invalidate(self, directory: str | Path) -> None:
+        """Drop every cached index under ``directory`` (e.g. before deleting it)."""
+        root = Path(directory).resolve()
+        with self._lock:
+            for path in [p for p in self._open if root in Path(p).resolve().parents]:
+                self._retire(self._open.pop(path))
+
+    def close(self) -> None:
+        with self._lock:
+            while self._open:
+                self._retire(self._open.popitem()[1])
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    @staticmethod
+    def _retire(entry: _CachedIndex) -> None:
+        if entry.users == 0:
+            entry.index.close()
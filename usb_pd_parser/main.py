@@ -3,14 +3,32 @@ from __future__ import annotations
 import argparse
 import logging
 from pathlib import Path
+from typing import List, Tuple
 
+from .backends import BACKENDS, get_backend
 from .config import Config
 from .pipeline import Pipeline
+from .utils import parse_page_range, parse_section_filter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("usb_pd_parser")
 
 
+def _page_range_arg(spec: str) -> Tuple[int, int]:
+    """argparse type: report a malformed --pages value as a usage error, not a traceback."""
+    try:
+        return parse_page_range(spec)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid page range {spec!r}; expected e.g. '120-180' or '120'")
+
+
+def _section_filter_arg(spec: str) -> List[str]:
+    patterns = parse_section_filter(spec)
+    if not patterns:
+        raise argparse.ArgumentTypeError(f"invalid section filter {spec!r}; expected e.g. '6' or '6.4.*,7.1'")
+    return patterns
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="USB-PD PDF parser (OO)")
     parser.add_argument("--pdf", required=True, help="Path to USB PD PDF")
@@ -18,19 +36,46 @@ def main() -> None:
     parser.add_argument("--out_dir", default=".", help="Output directory")
     parser.add_argument("--toc_start", type=int, default=None, help="ToC start page")
     parser.add_argument("--toc_end", type=int, default=None, help="ToC end page")
+    parser.add_argument(
+        "--sections",
+        type=_section_filter_arg,
+        default=None,
+        help="Only parse these sections, e.g. '6' or '6.4.*,7.1'",
+    )
+    parser.add_argument(
+        "--pages",
+        type=_page_range_arg,
+        default=None,
+        help="Only parse sections within pages, e.g. '120-180'",
+    )
+    parser.add_argument(
+        "--toc_source",
+        choices=["auto", "outline", "text"],
+        default="auto",
+        help="Read the ToC from PDF bookmarks, ToC pages, or bookmarks with ToC-page fallback",
+    )
+    parser.add_argument(
+        "--backend", choices=list(BACKENDS), default="pdfplumber", help="PDF text-extraction backend"
+    )
     args = parser.parse_args()
+    try:
+        get_backend(args.backend)
+    except ValueError as e:
+        parser.error(str(e))
 
     if not Path(args.pdf).exists():
         logger.error("PDF not found: %s", args.pdf)
         raise SystemExit(2)
 
-    cfg = Config()
+    cfg = Config(toc_source=args.toc_source, pdf_backend=args.backend)
     outputs = Pipeline(cfg).run(
         pdf_path=args.pdf,
         doc_title=args.doc_title,
         out_dir=args.out_dir,
         toc_start=args.toc_start,
         toc_end=args.toc_end,
+        section_filter=args.sections,
+        page_range=args.pages,
     )
     logger.info("Done. Outputs:\n%s", "\n".join(f"{k}: {v}" for k, v in outputs.items()))
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 
 from .config import Config
 from .pdf_document import PDFDocument
@@ -12,13 +12,18 @@ from .pdf_document import PDFDocument
 class MetadataExtractor:
     cfg: Config
 
-    def extract(self, pdf: PDFDocument, doc_title: str) -> List[Dict]:
-        """Heuristically find 'Table x-y' and 'Figure x-y' across pages."""
+    def extract(
+        self, pdf: PDFDocument, doc_title: str, pages: Optional[Iterable[int]] = None
+    ) -> List[Dict]:
+        """Heuristically find 'Table x-y' and 'Figure x-y' across pages (all, or only ``pages``)."""
         patterns = {k: re.compile(v) for k, v in self.cfg.metadata_regexes.items()}
         results: List[Dict] = []
-        for pno, text in enumerate(pdf.load_all_text(), start=1):
+        if pages is None:
+            pages = range(1, pdf.num_pages() + 1)
+        for model in pdf.page_models(pages):
+            pno = model.page
             for kind, pat in patterns.items():
-                for m in pat.finditer(text or ""):
+                for m in pat.finditer(model.text):
                     ident = m.group(0)
                     title = ident  # Without true captions we reuse ident
                     results.append(
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, List, Set
+
+from .backends import Margins
+from .utils import normalize_ws, split_lines
+
+_DIGITS = re.compile(r"\d+")
+
+# fewer non-blank pages than this are too few to tell running lines from chance repeats
+RUNNING_MIN_PAGES = 3
+
+
+@dataclass
+class PageModel:
+    """Per-page view shared by all extractors; built once and memoised on PDFDocument."""
+
+    page: int
+    raw: str
+    lines: List[str]        # body lines, running header/footer removed
+    text: str = field(init=False)
+    normalized: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.text = "\n".join(self.lines)
+        self.normalized = normalize_ws(self.text)
+
+
+def line_signature(line: str) -> str:
+    """Page-independent shape of a line: 'Page 123' and 'Page 7' share a signature."""
+    return _DIGITS.sub("#", normalize_ws(line).lower())
+
+
+def detect_running_lines(
+    margins: Iterable[Margins], min_ratio: float, min_pages: int = RUNNING_MIN_PAGES
+) -> Set[str]:
+    """Signatures of margin-band lines that recur on at least ``min_ratio`` of the pages.
+
+    Only lines the backend found inside the top/bottom margin bands are counted, so
+    body text that repeats from page to page is never mistaken for a running line.
+    """
+    counts: Counter = Counter()
+    n = 0
+    for header, footer in margins:
+        n += 1
+        counts.update({line_signature(l) for l in header + footer})
+    if n < min_pages:
+        return set()
+    return {sig for sig, c in counts.items() if c / n >= min_ratio}
+
+
+def sample_pages(total: int, n: int) -> List[int]:
+    """Up to ``n`` evenly spaced 1-indexed pages; deterministic for a given page count."""
+    if total <= 0 or n <= 0:
+        return []
+    if total <= n:
+        return list(range(1, total + 1))
+    step = total / n
+    return sorted({int(i * step) + 1 for i in range(n)})
+
+
+def build_page_model(
+    page: int, raw: str, margins: Margins, running: Set[str], edge_lines: int
+) -> PageModel:
+    """Strip up to ``edge_lines`` running lines from each end, if they lie in the margin bands."""
+    lines = split_lines(raw)
+    if running:
+        # either band may come first: stream-order backends (pdfium) can emit the footer first
+        edge = {line_signature(l) for l in margins[0] + margins[1]} & running
+        for end in (0, -1):
+            stripped = 0
+            while lines and stripped < edge_lines and line_signature(lines[end]) in edge:
+                lines.pop(end)
+                stripped += 1
+    return PageModel(page=page, raw=raw, lines=lines)
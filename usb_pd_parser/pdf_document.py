@@ -1,33 +1,144 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 import pdfplumber
+from pdfminer.pdfdocument import PDFNoOutlines
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import resolve1
+from pdfminer.psparser import PSLiteral
+
+from .backends import NO_MARGINS, Margins, get_backend
+from .page_model import RUNNING_MIN_PAGES, PageModel, build_page_model, detect_running_lines
 
 
 @dataclass
 class PDFDocument:
     path: str
+    backend: str = "pdfplumber"   # text-extraction engine, see backends.BACKENDS
     _all_text: Optional[List[str]] = None   # cache
+    on_page: Optional[Callable[[int, int], None]] = None   # (pages_done, total) hook
+    _page_text: Dict[int, str] = field(default_factory=dict)   # per-page cache, 1-indexed
+    _num_pages: Optional[int] = None
+    margin_pt: float = 0.0   # header/footer band height collected with page text; 0 skips it
+    # Layout model caches; None-defaults so lightweight subclasses need not init them
+    _page_margins: Optional[Dict[int, Margins]] = None
+    _models: Optional[Dict[int, PageModel]] = None
+    _running: Optional[Set[str]] = None
+    _edge_lines: int = 2
+    _outline: Optional[List[Tuple[int, str, Optional[int]]]] = None
 
     def num_pages(self) -> int:
-        with pdfplumber.open(self.path) as pdf:
-            return len(pdf.pages)
+        if self._num_pages is None:
+            with pdfplumber.open(self.path) as pdf:
+                self._num_pages = len(pdf.pages)
+        return self._num_pages
 
     def load_all_text(self) -> List[str]:
         """Load text for all pages; cached after first call. Pages are 1-indexed externally."""
         if self._all_text is None:
-            with pdfplumber.open(self.path) as pdf:
-                self._all_text = [(p.extract_text() or "") for p in pdf.pages]
+            total = self.num_pages()
+            self._extract(range(1, total + 1))
+            self._all_text = [self._page_text[p] for p in range(1, total + 1)]
         return self._all_text
 
     def load_pages_text(self, pages: Optional[Iterable[int]] = None) -> List[str]:
-        """Load text for specific 1-indexed page numbers."""
-        all_text = self.load_all_text()
+        """Load text for specific 1-indexed page numbers; only uncached pages are extracted."""
         if pages is None:
-            return all_text
-        out: List[str] = []
-        for p in pages:
-            if 1 <= p <= len(all_text):
-                out.append(all_text[p - 1])
-        return out
+            return self.load_all_text()
+        total = self.num_pages()
+        wanted = [p for p in pages if 1 <= p <= total]
+        self._extract(wanted)
+        return [self._page_text[p] for p in wanted]
+
+    def outline(self) -> List[Tuple[int, str, Optional[int]]]:
+        """(depth, title, 1-indexed page or None) per bookmark; reads structure only, no page text."""
+        if self._outline is None:
+            with pdfplumber.open(self.path) as pdf:
+                doc = pdf.doc
+                page_nos = {p.pageid: i for i, p in enumerate(PDFPage.create_pages(doc), start=1)}
+                self._num_pages = self._num_pages or len(page_nos)
+                try:
+                    raw = list(doc.get_outlines())
+                except PDFNoOutlines:
+                    raw = []
+                self._outline = [
+                    (level, title, self._resolve_dest(doc, dest, action, page_nos))
+                    for level, title, dest, action, _se in raw
+                ]
+        return self._outline
+
+    @staticmethod
+    def _resolve_dest(doc: Any, dest: Any, action: Any, page_nos: Dict[int, int]) -> Optional[int]:
+        """Follow a bookmark's /Dest or /A GoTo action (named or explicit) to a page number."""
+        try:
+            if dest is None:
+                action = resolve1(action)
+                if not isinstance(action, dict) or getattr(resolve1(action.get("S")), "name", None) != "GoTo":
+                    return None
+                dest = action.get("D")
+            dest = resolve1(dest)
+            if isinstance(dest, PSLiteral):
+                dest = dest.name
+            if isinstance(dest, (str, bytes)):
+                dest = resolve1(doc.get_dest(dest))
+            if isinstance(dest, dict):
+                dest = resolve1(dest.get("D"))
+            if isinstance(dest, list) and dest:
+                return page_nos.get(getattr(dest[0], "objid", None))
+        except Exception:
+            return None   # malformed or dangling destinations are common; treat as unknown
+        return None
+
+    # ---------- page model ----------
+    def detect_running_lines(self, pages: Iterable[int], edge_lines: int, min_ratio: float) -> Set[str]:
+        """Learn running header/footer signatures from ``pages`` and apply them to page models."""
+        pages = [p for p in pages if 1 <= p <= self.num_pages()]
+        # blank pages carry no running lines and would only dilute the ratio
+        texts = self.load_pages_text(pages)
+        samples = [self._margins(p) for p, text in zip(pages, texts) if text.strip()]
+        if len(samples) < RUNNING_MIN_PAGES and self._running is not None:
+            # too few pages to judge (e.g. a one-page partial run): keep what was learned before
+            return set(self._running)
+        running = detect_running_lines(samples, min_ratio)
+        self.set_running_lines(running, edge_lines)
+        return running
+
+    def set_running_lines(self, running: Iterable[str], edge_lines: int) -> None:
+        self._running = set(running)
+        self._edge_lines = edge_lines
+        self._models = None   # models built before detection are stale
+
+    def page_models(self, pages: Iterable[int]) -> List[PageModel]:
+        """Memoised page models for 1-indexed pages; out-of-range pages are skipped."""
+        if self._models is None:
+            self._models = {}
+        total = self.num_pages()
+        wanted = [p for p in pages if 1 <= p <= total]
+        missing = [p for p in wanted if p not in self._models]
+        if missing:
+            for p, raw in zip(missing, self.load_pages_text(missing)):
+                self._models[p] = build_page_model(
+                    p, raw, self._margins(p), self._running or set(), self._edge_lines
+                )
+        return [self._models[p] for p in wanted]
+
+    def page_model(self, page: int) -> PageModel:
+        return self.page_models([page])[0]
+
+    def _margins(self, page: int) -> Margins:
+        return (self._page_margins or {}).get(page, NO_MARGINS)
+
+    def _extract(self, pages: Iterable[int]) -> None:
+        missing = [p for p in dict.fromkeys(pages) if p not in self._page_text]
+        if not missing:
+            return
+        if self._page_margins is None:
+            self._page_margins = {}
+        missing.sort()
+        pages = get_backend(self.backend).extract(self.path, missing, margin_pt=self.margin_pt)
+        for i, (p, text, margins) in enumerate(pages, start=1):
+            self._page_text[p] = text
+            self._page_margins[p] = margins
+            if self.on_page is not None:
+                self.on_page(i, len(missing))
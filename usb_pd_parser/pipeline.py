@@ -1,17 +1,23 @@
 from __future__ import annotations
+import logging
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+from .chunker import Chunker, EmbedFn
 from .config import Config
 from .metadata_extractor import MetadataExtractor
+from .page_model import sample_pages
 from .pdf_document import PDFDocument
+from .progress import ProgressCallback, ProgressReporter
 from .section_extractor import SectionExtractor
 from .toc_extractor import ToCExtractor
-from .utils import write_jsonl
+from .utils import iter_jsonl, match_section, write_jsonl
 from .validator import Validator
 
+logger = logging.getLogger("usb_pd_parser")
+
 
 @dataclass
 class Pipeline:
@@ -26,42 +32,151 @@ class Pipeline:
         toc_end: int | None = None,
         toc_pages: int | None = None,   # added
         use_llm: bool = False,          # added
+        embed_fn: Optional[EmbedFn] = None,
+        progress: Optional[ProgressCallback] = None,
+        section_filter: Optional[Sequence[str]] = None,
+        page_range: Optional[Tuple[int, int]] = None,
     ) -> Dict[str, str]:
         """
         Runs the full pipeline:
-        - Extract ToC
+        - Extract ToC: from the outline when present, before any page text is read;
+          otherwise parse the ToC pages, learning running headers/footers from them first
+        - Select sections (all, or those matching section_filter / overlapping page_range)
+        - Extract text for only the pages the selected sections span
+        - Re-learn running headers/footers from a sample of those pages
         - Extract Sections
+        - Chunk sections for vector stores (optionally embedded via embed_fn)
         - Extract Metadata
         - Validate results & generate report
+
+        ``progress`` receives throttled ProgressEvents (stage, pages done/total,
+        rows emitted, ETA) while the pipeline runs.
         """
+        reporter = ProgressReporter(progress, min_interval_s=self.cfg.progress_interval_s)
 
         pdf = PDFDocument(pdf_path)
+        pdf.backend = self.cfg.pdf_backend
+        pdf.margin_pt = self.cfg.running_lines_margin_pt
+        pdf.on_page = reporter.update
 
-        toc = ToCExtractor(self.cfg).extract(
+        reporter.stage("toc")
+        toc_extractor = ToCExtractor(self.cfg, on_toc_pages=lambda p: self.learn_running_lines(pdf, p))
+        toc = toc_extractor.extract(
             pdf, doc_title, toc_start=toc_start, toc_end=toc_end
         )
-        sections = SectionExtractor().extract(pdf, toc)
-        metadata = MetadataExtractor(self.cfg).extract(pdf, doc_title)
+        if self.cfg.toc_cross_check and toc_extractor.source == "outline":
+            parsed = toc_extractor.extract_from_text(pdf, doc_title, toc_start=toc_start, toc_end=toc_end)
+            diff = ToCExtractor.cross_check(toc, parsed)
+            logger.info(
+                "ToC cross-check (outline vs. ToC pages): %d only in outline, %d only in ToC pages, "
+                "%d page mismatches",
+                len(diff["only_primary"]), len(diff["only_reference"]), len(diff["page_mismatch"]),
+            )
+        reporter.update(1, 1, rows=len(toc))
+
+        full_toc = toc
+        section_extractor = SectionExtractor()
+        partial = bool(section_filter) or page_range is not None
+        selected_ids: Optional[List[str]] = None
+        pages: Optional[List[int]] = None
+        if partial:
+            spans = [
+                (entry, start, end)
+                for entry, start, end in section_extractor.spans(pdf, toc)
+                if (not section_filter or match_section(entry["section_id"], section_filter))
+                and (page_range is None or (start <= page_range[1] and end >= page_range[0]))
+            ]
+            selected_ids = [entry["section_id"] for entry, _, _ in spans]
+            toc = [entry for entry, _, _ in spans]
+            pages = sorted({p for _, start, end in spans for p in range(start, end + 1)})
+
+        reporter.stage("extract_text", total=len(pages) if partial else pdf.num_pages())
+        pdf.load_pages_text(pages)
+
+        reporter.stage("layout")
+        self.learn_running_lines(pdf, pages)
+
+        reporter.stage("sections", total=len(toc))
+        # spans come from the full ToC so a selected section still ends where its successor starts
+        sections = section_extractor.extract(pdf, full_toc, section_ids=selected_ids)
+        reporter.update(len(toc), len(toc), rows=len(sections))
+
+        reporter.stage("metadata")
+        metadata = MetadataExtractor(self.cfg).extract(pdf, doc_title, pages=pages)
+        reporter.update(1, 1, rows=len(metadata))
+
+        return self.write_outputs(toc, sections, metadata, out_dir, embed_fn, reporter)
+
+    def learn_running_lines(self, pdf: PDFDocument, pages: Optional[Sequence[int]] = None) -> List[str]:
+        """Detect running header/footer lines so every later stage sees them stripped.
+
+        The sample is drawn from ``pages`` (default: the whole document), so a
+        partial run never extracts pages it would not otherwise read.
+        """
+        n = self.cfg.running_lines_sample_pages
+        if n <= 0:
+            return []
+        pages = list(pages) if pages is not None else list(range(1, pdf.num_pages() + 1))
+        running = pdf.detect_running_lines(
+            [pages[i - 1] for i in sample_pages(len(pages), n)],
+            self.cfg.running_lines_edge_lines,
+            self.cfg.running_lines_min_ratio,
+        )
+        return sorted(running)
 
+    def write_outputs(
+        self,
+        toc: List[Dict],
+        sections: List[Dict],
+        metadata: List[Dict],
+        out_dir: str,
+        embed_fn: Optional[EmbedFn] = None,
+        reporter: Optional[ProgressReporter] = None,
+    ) -> Dict[str, str]:
+        """Write JSONL outputs, chunks and the validation report; returns their paths."""
+        reporter = reporter or ProgressReporter()
         out = {
             "toc": str(Path(out_dir, self.cfg.toc_jsonl)),
             "sections": str(Path(out_dir, self.cfg.sections_jsonl)),
             "metadata": str(Path(out_dir, self.cfg.metadata_jsonl)),
+            "chunks": str(Path(out_dir, self.cfg.chunks_jsonl)),
             "report": str(Path(out_dir, self.cfg.validation_report)),
         }
 
         Path(out_dir).mkdir(parents=True, exist_ok=True)
 
-        write_jsonl(toc, out["toc"])
-        write_jsonl(sections, out["sections"])
-        write_jsonl(metadata, out["metadata"])
+        write_jsonl(toc, out["toc"], index=True, index_key="section_id")
+        write_jsonl(sections, out["sections"], index=True, index_key="section_id")
+        write_jsonl(metadata, out["metadata"], index=True)
 
-        results = Validator().validate(toc, sections, metadata)
+        reporter.stage("chunks", total=len(sections))
+        chunks = Chunker(self.cfg, embed_fn=embed_fn).iter_chunks(sections)
+        write_jsonl(
+            _counted(chunks, reporter, len(sections)), out["chunks"], index=True, index_key="chunk_id"
+        )
+
+        reporter.stage("validate")
+        # re-read the chunk file as a stream so validation never holds every chunk
+        results = Validator().validate(toc, sections, metadata, chunks=iter_jsonl(out["chunks"]))
         Validator().write_excel_report(results, out["report"])
 
+        reporter.finish(rows=len(toc) + len(sections) + len(metadata))
         return out
 
 
+def _counted(rows: Iterable[Dict], reporter: ProgressReporter, total: int) -> Iterator[Dict]:
+    """Pass rows through, reporting how many sections have been chunked so far."""
+    n = 0
+    done = 0
+    last: Optional[str] = None
+    for row in rows:
+        n += 1
+        if row["section_id"] != last:
+            done, last = done + 1, row["section_id"]
+        reporter.update(done, total, rows=n)
+        yield row
+
+
 # -------------------------
 # Convenience wrapper so server.py can call run_pipeline()
 # -------------------------
@@ -71,8 +186,12 @@ def run_pipeline(
     out_dir: str,
     toc_start: int | None = None,
     toc_end: int | None = None,
+    progress: Optional[ProgressCallback] = None,
+    section_filter: Optional[Sequence[str]] = None,
+    page_range: Optional[Tuple[int, int]] = None,
+    backend: str = "pdfplumber",
 ) -> dict:
-    cfg = Config()
+    cfg = Config(pdf_backend=backend)
     pipeline = Pipeline(cfg)
     return pipeline.run(
         pdf_path=pdf_path,
@@ -80,5 +199,8 @@ def run_pipeline(
         out_dir=out_dir,
         toc_start=toc_start,
         toc_end=toc_end,
+        progress=progress,
+        section_filter=section_filter,
+        page_range=page_range,
     )
 
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import asdict, dataclass
+from typing import Dict
+
+from pdfminer.pdfdocument import PDFDocument as MinerDocument
+from pdfminer.pdfdocument import PDFEncryptionError, PDFPasswordIncorrect
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+from pdfminer.psparser import PSException
+
+from .page_model import sample_pages
+
+# text-showing operators (Tj, TJ, ', ") follow a string or array operand
+_SHOW_TEXT = re.compile(rb"[)>\]]\s*(?:Tj|TJ|'|\")")
+
+
+@dataclass
+class PreflightReport:
+    file_size: int
+    num_pages: int
+    has_text_layer: bool
+    text_page_ratio: float   # share of sampled pages that draw text
+    encrypted: bool = False
+    error: str = ""
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def preflight(path: str, sample: int = 16) -> PreflightReport:
+    """Read size, page count and text-layer presence from PDF structure only.
+
+    Walks the page tree and, for a small page sample, scans the raw content
+    streams for text objects; no text is extracted or laid out. Scanned pages
+    draw only image XObjects.
+    """
+    size = os.path.getsize(path)
+    try:
+        with open(path, "rb") as f:
+            doc = MinerDocument(PDFParser(f))
+            pages = list(PDFPage.create_pages(doc))
+            picked = sample_pages(len(pages), sample)
+            with_text = sum(1 for p in picked if _has_text(pages[p - 1]))
+    except (PDFPasswordIncorrect, PDFEncryptionError) as e:
+        return PreflightReport(size, 0, False, 0.0, encrypted=True, error=str(e) or "encrypted")
+    except (PSException, ValueError, KeyError, TypeError, AttributeError) as e:
+        # PSException covers PDFException and truncated files (PSEOF); AttributeError
+        # comes from content entries that are not streams
+        return PreflightReport(size, 0, False, 0.0, error=f"unreadable PDF: {e or type(e).__name__}")
+    ratio = with_text / len(picked) if picked else 0.0
+    return PreflightReport(size, len(pages), with_text > 0, round(ratio, 3))
+
+
+def _has_text(page: PDFPage) -> bool:
+    """Fonts declared and glyphs actually shown, on the page or in a form XObject."""
+    if _draws_text(page.resources, page.contents):
+        return True
+    xobjects = resolve1((page.resources or {}).get("XObject")) or {}
+    for xobj in xobjects.values():
+        xobj = resolve1(xobj)
+        attrs = getattr(xobj, "attrs", {}) or {}
+        if getattr(resolve1(attrs.get("Subtype")), "name", None) == "Form":
+            if _draws_text(resolve1(attrs.get("Resources")), [xobj]):
+                return True
+    return False
+
+
+def _draws_text(resources, streams) -> bool:
+    if not resolve1((resources or {}).get("Font")):
+        return False
+    for stream in streams or []:
+        data = resolve1(stream).get_data()
+        if _SHOW_TEXT.search(data):
+            return True
+    return False
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Optional
+
+
+@dataclass
+class ProgressEvent:
+    stage: str
+    done: int = 0
+    total: int = 0
+    rows: int = 0
+    elapsed_s: float = 0.0
+    eta_s: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+@dataclass
+class ProgressReporter:
+    """Throttled progress emitter shared by all pipeline stages.
+
+    ``update`` is cheap enough to call once per page: it only reads the clock and
+    forwards an event when ``min_interval_s`` has passed or the stage completes.
+    """
+
+    callback: Optional[ProgressCallback] = None
+    min_interval_s: float = 0.5
+    _stage: str = field(default="", init=False)
+    _stage_started: float = field(default=0.0, init=False)
+    _started: float = field(default_factory=time.monotonic, init=False)
+    _last_emit: float = field(default=0.0, init=False)
+
+    def stage(self, name: str, total: int = 0) -> None:
+        """Start a new stage; always emitted."""
+        self._stage = name
+        self._stage_started = time.monotonic()
+        self._emit(ProgressEvent(stage=name, total=total), self._stage_started)
+
+    def update(self, done: int, total: int = 0, rows: int = 0) -> None:
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        if now - self._last_emit < self.min_interval_s and (not total or done < total):
+            return
+        eta: Optional[float] = None
+        if total and done:
+            eta = round((now - self._stage_started) / done * (total - done), 2)
+        self._emit(
+            ProgressEvent(stage=self._stage, done=done, total=total, rows=rows, eta_s=eta), now
+        )
+
+    def finish(self, rows: int = 0) -> None:
+        self._emit(ProgressEvent(stage="done", rows=rows, eta_s=0.0), time.monotonic())
+
+    def _emit(self, event: ProgressEvent, now: float) -> None:
+        if self.callback is None:
+            return
+        event.elapsed_s = round(now - self._started, 2)
+        self._last_emit = now
+        self.callback(event)
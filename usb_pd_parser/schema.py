@@ -55,6 +55,21 @@ METADATA_SCHEMA: Dict[str, Any] = {
     },
 }
 
+CHUNK_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "required": ["doc_title", "chunk_id", "section_id", "full_path", "page", "chunk_index", "text"],
+    "properties": {
+        "doc_title": {"type": "string"},
+        "chunk_id": {"type": "string"},
+        "section_id": {"type": "string"},
+        "full_path": {"type": "string"},
+        "page": {"type": "integer", "minimum": 1},
+        "chunk_index": {"type": "integer", "minimum": 0},
+        "text": {"type": "string"},
+        "embedding": {"type": "array", "items": {"type": "number"}},
+    },
+}
+
 
 def validate_item(item: dict, schema: Dict[str, Any]) -> Tuple[bool, str | None]:
     validator = Draft7Validator(schema)
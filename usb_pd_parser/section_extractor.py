@@ -1,36 +1,44 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from .pdf_document import PDFDocument
-from .utils import normalize_ws
 
 
 @dataclass
 class SectionExtractor:
-    def extract(self, pdf: PDFDocument, toc: List[Dict]) -> List[Dict]:
-        """Slice section text by page ranges derived from ToC ordering."""
-        if not toc:
-            return []
-
+    def spans(self, pdf: PDFDocument, toc: List[Dict]) -> List[Tuple[Dict, int, int]]:
+        """Derive (entry, start_page, end_page) per ToC entry from ToC ordering."""
         # Sort by section index to compute page ranges
         toc_sorted = sorted(toc, key=lambda e: tuple(int(x) for x in e["section_id"].split(".")))
+        total = pdf.num_pages()
         # derive start page per entry; next entry's start - 1 as end
-        spans: List[Tuple[int, int]] = []
+        spans: List[Tuple[Dict, int, int]] = []
         for i, entry in enumerate(toc_sorted):
             start = max(1, int(entry.get("page", 1)))
             if i < len(toc_sorted) - 1:
                 next_start = max(1, int(toc_sorted[i + 1].get("page", start)))
                 end = max(start, next_start - 1)
             else:
-                end = pdf.num_pages()
-            spans.append((start, end))
+                end = total
+            spans.append((entry, start, min(end, total)))
+        return spans
+
+    def extract(
+        self, pdf: PDFDocument, toc: List[Dict], section_ids: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        """Slice section text by page ranges; ``section_ids`` restricts output to a subset."""
+        if not toc:
+            return []
 
-        all_pages = pdf.load_all_text()
+        wanted = set(section_ids) if section_ids is not None else None
         sections: List[Dict] = []
-        for entry, (start, end) in zip(toc_sorted, spans):
-            joined = " ".join(normalize_ws(all_pages[p - 1]) for p in range(start, min(end, len(all_pages)) + 1))
+        for entry, start, end in self.spans(pdf, toc):
+            if wanted is not None and entry["section_id"] not in wanted:
+                continue
+            models = pdf.page_models(range(start, end + 1))
+            joined = " ".join(m.normalized for m in models)
             item = {
                 **entry,
                 "text": joined.strip(),
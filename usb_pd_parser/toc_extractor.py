@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import logging
 import re
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 from .config import Config
+from .page_model import PageModel
 from .pdf_document import PDFDocument
-from .utils import split_lines
+
+logger = logging.getLogger("usb_pd_parser.toc")
 
 
 @dataclass
 class ToCExtractor:
     cfg: Config
+    # called with the ToC page range before it is parsed (e.g. to learn running lines)
+    on_toc_pages: Optional[Callable[[List[int]], None]] = None
+    source: str = field(default="", init=False)   # "outline" or "text" after extract()
 
     # ---------- public API ----------
     def extract(
@@ -21,9 +27,49 @@ class ToCExtractor:
         toc_start: Optional[int] = None,
         toc_end: Optional[int] = None,
     ) -> List[Dict]:
+        """ToC from the PDF outline when it has one (cfg.toc_source), else parsed from ToC pages."""
+        if self.cfg.toc_source in ("auto", "outline"):
+            entries = self.extract_from_outline(pdf, doc_title)
+            if len(entries) >= self.cfg.toc_outline_min_entries or self.cfg.toc_source == "outline":
+                self.source = "outline"
+                return entries
+        self.source = "text"
+        return self.extract_from_text(pdf, doc_title, toc_start=toc_start, toc_end=toc_end)
+
+    def extract_from_outline(self, pdf: PDFDocument, doc_title: str) -> List[Dict]:
+        """Map numbered bookmarks ('6.4 Protocol Layer') to ToC entries with exact pages."""
+        try:
+            outline = pdf.outline()
+        except Exception:
+            logger.warning("Could not read PDF outline; falling back to ToC page parsing", exc_info=True)
+            return []
+
+        pat = re.compile(r"^\s*(\d+(?:\.\d+)*)\.?\s+(.+?)\s*$")
+        by_id: Dict[str, Dict] = {}
+        for _depth, title, page in outline:
+            m = pat.match(" ".join((title or "").split()))
+            if not m or page is None:
+                continue  # unnumbered bookmarks (Annex, Revision History, ...) or dangling dests
+            sec_id, text = m.group(1), m.group(2).rstrip(".")
+            if sec_id in by_id:
+                continue
+            by_id[sec_id] = self._entry(doc_title, sec_id, text, page)
+        entries = self._ensure_parent_sections(list(by_id.values()), doc_title)
+        entries.sort(key=self._section_sort_key)
+        return entries
+
+    def extract_from_text(
+        self,
+        pdf: PDFDocument,
+        doc_title: str,
+        toc_start: Optional[int] = None,
+        toc_end: Optional[int] = None,
+    ) -> List[Dict]:
+        """Regex parse of the ToC pages (dotted leaders, trailing page, no page)."""
         start, end = self._resolve_toc_range(pdf, toc_start, toc_end)
-        page_texts = pdf.load_pages_text(range(start, end + 1))
-        lines = self._collect_toc_lines(page_texts, start)
+        if self.on_toc_pages is not None:
+            self.on_toc_pages(list(range(start, end + 1)))
+        lines = self._collect_toc_lines(pdf.page_models(range(start, end + 1)))
         # core parse
         entries = self._parse_lines(lines, doc_title)
         # parent preservation (ensure 2, 2.1 exist if 2.1.1 present)
@@ -32,6 +78,21 @@ class ToCExtractor:
         entries.sort(key=self._section_sort_key)
         return entries
 
+    @staticmethod
+    def cross_check(primary: List[Dict], reference: List[Dict]) -> Dict[str, List]:
+        """Compare two ToCs (e.g. outline vs. parsed ToC pages) by section id and page."""
+        a = {e["section_id"]: e for e in primary}
+        b = {e["section_id"]: e for e in reference}
+        return {
+            "only_primary": sorted(set(a) - set(b), key=ToCExtractor._id_key),
+            "only_reference": sorted(set(b) - set(a), key=ToCExtractor._id_key),
+            "page_mismatch": [
+                (sid, a[sid]["page"], b[sid]["page"])
+                for sid in sorted(set(a) & set(b), key=ToCExtractor._id_key)
+                if a[sid]["page"] != b[sid]["page"]
+            ],
+        }
+
     # ---------- range detection ----------
     def _resolve_toc_range(
         self, pdf: PDFDocument, start: Optional[int], end: Optional[int]
@@ -53,15 +114,16 @@ class ToCExtractor:
         return 1, fallback_end
 
     def _detect_toc_range(self, pdf: PDFDocument) -> Optional[Tuple[int, int]]:
-        texts = pdf.load_pages_text(range(1, min(self.cfg.max_scan_pages, pdf.num_pages()) + 1))
+        models = pdf.page_models(range(1, min(self.cfg.max_scan_pages, pdf.num_pages()) + 1))
+        texts = [m.text for m in models]
+        tocish = re.compile(r"^\s*\d+(?:\.\d+)*\s+\S+")
 
         def has_heading(text: str, phrases: Sequence[str]) -> bool:
             low = (text or "").lower()
             return any(p in low for p in phrases)
 
-        def tocish_count(text: str) -> int:
-            pat = re.compile(r"^\s*\d+(?:\.\d+)*\s+\S+")
-            return sum(1 for l in split_lines(text) if pat.match(l))
+        def tocish_count(page: int) -> int:
+            return sum(1 for l in models[page - 1].lines if tocish.match(l))
 
         start: Optional[int] = None
         # 1) look for explicit heading
@@ -72,13 +134,13 @@ class ToCExtractor:
 
         # 2) if not found: dense numeric lines
         if start is None:
-            dense = [(i + 1, tocish_count(t)) for i, t in enumerate(texts)]
+            dense = [(i, tocish_count(i)) for i in range(1, len(models) + 1)]
             candidates = [p for p, c in dense if c >= 6]
             if candidates:
                 start = min(candidates)
                 end = start
                 p = start + 1
-                while p <= len(texts) and tocish_count(texts[p - 1]) >= 3:
+                while p <= len(texts) and tocish_count(p) >= 3:
                     end = p
                     p += 1
                 return start, end
@@ -88,7 +150,7 @@ class ToCExtractor:
             end = start
             for p in range(start, len(texts) + 1):
                 t = texts[p - 1] or ""
-                if tocish_count(t) <= 2 and re.search(r"^\s*1(\.\d+)*\s", t, re.M):
+                if tocish_count(p) <= 2 and re.search(r"^\s*1(\.\d+)*\s", t, re.M):
                     end = p
                     break
                 end = p
@@ -97,15 +159,14 @@ class ToCExtractor:
         return None
 
     # ---------- line collection & parsing ----------
-    def _collect_toc_lines(self, page_texts: List[str], start_page_num: int) -> List[str]:
+    def _collect_toc_lines(self, models: List[PageModel]) -> List[str]:
         lines: List[str] = []
-        for page_offset, text in enumerate(page_texts):
-            pno = start_page_num + page_offset
-            low = (text or "").lower()
+        for model in models:
+            low = model.text.lower()
             if any(key in low for key in self.cfg.toc_exclude_page_headings):
                 # skip revision/errata pages inside the range
                 continue
-            lines.extend(split_lines(text))
+            lines.extend(model.lines)
         # join wrapped titles
         return self._join_wrapped(lines)
 
@@ -149,25 +210,31 @@ class ToCExtractor:
             if not sec_id or not title:
                 continue
 
-            level = sec_id.count(".") + 1
-            parent = sec_id.rsplit(".", 1)[0] if level > 1 else None
-            items.append(
-                {
-                    "doc_title": doc_title,
-                    "section_id": sec_id,
-                    "title": title,
-                    "full_path": f"{sec_id} {title}",
-                    "page": int(page) if page else 1,
-                    "level": level,
-                    "parent_id": parent,
-                    "tags": [],
-                }
-            )
+            items.append(self._entry(doc_title, sec_id, title, int(page) if page else 1))
         return items
 
+    @staticmethod
+    def _entry(doc_title: str, sec_id: str, title: str, page: int) -> Dict:
+        level = sec_id.count(".") + 1
+        parent = sec_id.rsplit(".", 1)[0] if level > 1 else None
+        return {
+            "doc_title": doc_title,
+            "section_id": sec_id,
+            "title": title,
+            "full_path": f"{sec_id} {title}",
+            "page": page,
+            "level": level,
+            "parent_id": parent,
+            "tags": [],
+        }
+
     # ---------- hierarchy helpers ----------
     def _ensure_parent_sections(self, items: List[Dict], doc_title: str) -> List[Dict]:
-        """If 2.1.1 exists but 2 or 2.1 missing, synthesize parents."""
+        """If 2.1.1 exists but 2 or 2.1 missing, synthesize parents.
+
+        A synthesized parent starts on the first page of its earliest child, so its
+        span never reaches back into the front matter.
+        """
         by_id = {i["section_id"]: i for i in items}
         needed: List[str] = []
         for sec in list(by_id):
@@ -182,12 +249,16 @@ class ToCExtractor:
         for pid in needed:
             level = pid.count(".") + 1
             parent = pid.rsplit(".", 1)[0] if level > 1 else None
+            child_pages = [
+                i["page"] for i in items
+                if i["section_id"].startswith(pid + ".") and isinstance(i.get("page"), int)
+            ]
             by_id[pid] = {
                 "doc_title": doc_title,
                 "section_id": pid,
                 "title": f"Section {pid}",
                 "full_path": f"{pid} Section {pid}",
-                "page": 1,
+                "page": min(child_pages, default=1),
                 "level": level,
                 "parent_id": parent,
                 "tags": [],
@@ -196,7 +267,11 @@ class ToCExtractor:
 
     @staticmethod
     def _section_sort_key(e: Dict) -> Tuple[int, ...]:
+        return ToCExtractor._id_key(e["section_id"])
+
+    @staticmethod
+    def _id_key(section_id: str) -> Tuple[int, ...]:
         try:
-            return tuple(int(p) for p in e["section_id"].split("."))
+            return tuple(int(p) for p in section_id.split("."))
         except Exception:
             return (10**9,)
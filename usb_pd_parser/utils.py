@@ -1,16 +1,39 @@
 from __future__ import annotations
 
+import fnmatch
 import json
+from array import array
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+from .jsonl_index import write_index
 
-def write_jsonl(data: Iterable[dict], filename: str | Path) -> None:
+
+def write_jsonl(
+    data: Iterable[dict],
+    filename: str | Path,
+    index: bool = False,
+    index_key: Optional[str] = None,
+) -> None:
+    """Write rows as JSONL; with ``index`` also record byte offsets (and ``index_key`` -> row)."""
     p = Path(filename)
     p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("w", encoding="utf-8") as f:
+    if not index:
+        with p.open("w", encoding="utf-8") as f:
+            for row in data:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return
+
+    offsets = array("Q", [0])
+    keys: Optional[Dict[str, List[int]]] = {} if index_key else None
+    with p.open("wb") as f:
         for row in data:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            line = (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+            if keys is not None and row.get(index_key) is not None:
+                keys.setdefault(str(row[index_key]), [offsets[-1], len(line) - 1])
+            f.write(line)
+            offsets.append(offsets[-1] + len(line))
+    write_index(p, offsets, keys)
 
 
 def normalize_ws(text: str) -> str:
@@ -19,3 +42,40 @@ def normalize_ws(text: str) -> str:
 
 def split_lines(text: str) -> List[str]:
     return [ln.strip() for ln in (text or "").splitlines() if ln.strip()]
+
+
+def parse_page_range(spec: str) -> Tuple[int, int]:
+    """Parse '120-180' (or a single page '120') into an inclusive 1-indexed range."""
+    start, _, end = spec.strip().partition("-")
+    lo, hi = int(start), int(end or start)
+    if lo < 1 or hi < lo:
+        raise ValueError(f"Invalid page range: {spec!r}")
+    return lo, hi
+
+
+def parse_section_filter(spec: str) -> List[str]:
+    """Split a comma-separated section filter such as '6, 7.2.*'."""
+    return [s.strip() for s in spec.split(",") if s.strip()]
+
+
+def match_section(section_id: str, patterns: Sequence[str]) -> bool:
+    """A plain id ('6') selects that section and its subtree; wildcards use fnmatch ('6.4.*')."""
+    for pat in patterns:
+        if any(c in pat for c in "*?["):
+            if fnmatch.fnmatchcase(section_id, pat):
+                return True
+        elif section_id == pat or section_id.startswith(pat + "."):
+            return True
+    return False
+
+
+def read_jsonl(filename: str | Path) -> List[dict]:
+    return list(iter_jsonl(filename))
+
+
+def iter_jsonl(filename: str | Path) -> Iterator[dict]:
+    """Stream rows without holding the whole file in memory."""
+    with Path(filename).open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
 import pandas as pd
 
-from .schema import METADATA_SCHEMA, SECTION_SCHEMA, TOC_SCHEMA, validate_item
+from .schema import CHUNK_SCHEMA, METADATA_SCHEMA, SECTION_SCHEMA, TOC_SCHEMA, validate_item
 
 
 @dataclass
 class Validator:
     def validate(
-        self, toc: List[Dict], sections: List[Dict], metadata: List[Dict] | None = None
+        self,
+        toc: List[Dict],
+        sections: List[Dict],
+        metadata: List[Dict] | None = None,
+        chunks: Iterable[Dict] | None = None,
     ) -> Dict:
+        """``chunks`` may be a stream; rows are checked one at a time and only ids are kept."""
         toc_ids = [t["section_id"] for t in toc]
         sec_ids = [s["section_id"] for s in sections]
 
@@ -22,6 +27,21 @@ class Validator:
         if metadata:
             meta_fail = self._collect_schema_failures(metadata, METADATA_SCHEMA, id_key="id")
 
+        chunk_fail: List[Dict] = []
+        chunk_count = 0
+        duplicate_chunk_ids: List[str] = []
+        if chunks is not None:
+            seen = set()
+            for chunk in chunks:
+                chunk_count += 1
+                ok, err = validate_item(chunk, CHUNK_SCHEMA)
+                if not ok:
+                    chunk_fail.append({"item": chunk, "error": err, "id": chunk.get("chunk_id")})
+                cid = chunk.get("chunk_id")
+                if cid in seen:
+                    duplicate_chunk_ids.append(cid)
+                seen.add(cid)
+
         missing = sorted(list(set(toc_ids) - set(sec_ids)), key=self._sort_key)
         extra = sorted(list(set(sec_ids) - set(toc_ids)), key=self._sort_key)
         ordering_mismatch = self._ordering_mismatch(toc_ids, sec_ids)
@@ -39,12 +59,16 @@ class Validator:
                 "ordering_mismatch": ordering_mismatch,
                 "toc_table_count": toc_table_count,
                 "metadata_table_count": metadata_table_count,
+                "chunks_count": chunk_count,
+                "duplicate_chunk_ids_count": len(duplicate_chunk_ids),
             },
             "missing_sections": missing,
             "extra_sections": extra,
             "toc_schema_failures": toc_fail,
             "section_schema_failures": sec_fail,
             "metadata_schema_failures": meta_fail,
+            "chunk_schema_failures": chunk_fail,
+            "duplicate_chunk_ids": duplicate_chunk_ids,
         }
 
     def write_excel_report(self, results: Dict, output_path: str) -> None:
@@ -66,7 +90,8 @@ class Validator:
                     err = f.get("error")
                     rows.append(
                         {
-                            "item_id": (item or {}).get("section_id")
+                            "item_id": (item or {}).get("chunk_id")
+                            or (item or {}).get("section_id")
                             or (item or {}).get("id"),
                             "error": err,
                             "item_preview": str(item)[:400],
@@ -83,6 +108,12 @@ class Validator:
             failures_to_df(results.get("metadata_schema_failures", [])).to_excel(
                 writer, sheet_name="Metadata_Schema_Failures", index=False
             )
+            failures_to_df(results.get("chunk_schema_failures", [])).to_excel(
+                writer, sheet_name="Chunk_Schema_Failures", index=False
+            )
+            pd.DataFrame(results.get("duplicate_chunk_ids", []), columns=["duplicate_chunk_id"]).to_excel(
+                writer, sheet_name="DuplicateChunkIds", index=False
+            )
 
     # ---------- helpers ----------
     @staticmethod